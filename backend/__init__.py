@@ -1,45 +1,73 @@
 """
 Backend module for ToDoListApp.
 Provides database operations and utilities.
+
+Submodules are imported on first attribute access, so ``import backend``
+does not pull in SQLAlchemy until something from backend.database is used.
 """
 
-from .database import (
-    Task,
-    add_task,
-    get_all_tasks,
-    get_task_by_id,
-    update_task,
-    delete_task,
-    mark_task_complete,
-    mark_task_incomplete,
-    clear_all_tasks,
-    search_tasks,
-)
-
-from .utils import (
-    filter_tasks,
-    sort_tasks,
-    format_tasks,
-    get_overdue_tasks,
-    get_tasks_due_soon,
-    get_task_stats,
-)
-
-__all__ = [
-    "Task",
-    "add_task",
-    "get_all_tasks",
-    "get_task_by_id",
-    "update_task",
-    "delete_task",
-    "mark_task_complete",
-    "mark_task_incomplete",
-    "clear_all_tasks",
-    "search_tasks",
-    "filter_tasks",
-    "sort_tasks",
-    "format_tasks",
-    "get_overdue_tasks",
-    "get_tasks_due_soon",
-    "get_task_stats",
-]
\ No newline at end of file
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    # database
+    "Task": "database",
+    "TaskRow": "database",
+    "init_db": "database",
+    "add_task": "database",
+    "add_tasks": "database",
+    "get_all_tasks": "database",
+    "get_task_by_id": "database",
+    "update_task": "database",
+    "delete_task": "database",
+    "mark_task_complete": "database",
+    "mark_task_incomplete": "database",
+    "update_tasks": "database",
+    "delete_tasks": "database",
+    "mark_tasks_complete": "database",
+    "mark_tasks_incomplete": "database",
+    "clear_all_tasks": "database",
+    "search_tasks": "database",
+    "query_tasks": "database",
+    "query_overdue_tasks": "database",
+    "query_tasks_due_soon": "database",
+    "get_tasks_page": "database",
+    "iter_tasks": "database",
+    "enable_cache": "database",
+    "disable_cache": "database",
+    "cache_stats": "database",
+    "ChangeWatcher": "database",
+    "change_seq": "database",
+    "get_changes": "database",
+    "get_sqlite_pragmas": "database",
+    "schema_version": "database",
+    "query_task_stats": "database",
+    "enable_stats_counters": "database",
+    "disable_stats_counters": "database",
+    # transfer
+    "export_tasks": "transfer",
+    "import_tasks": "transfer",
+    # utils
+    "filter_tasks": "utils",
+    "sort_tasks": "utils",
+    "format_tasks": "utils",
+    "get_overdue_tasks": "utils",
+    "get_tasks_due_soon": "utils",
+    "get_task_stats": "utils",
+    "TitleIndex": "utils",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
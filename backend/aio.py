@@ -0,0 +1,386 @@
+"""
+Asyncio API for ToDoListApp.
+Awaitable versions of the backend.database functions, run on SQLAlchemy's
+async engine with the aiosqlite driver.
+
+Every function takes the same arguments and returns the same types as its
+backend.database counterpart, and builds the same SQL. Reads are not
+served from the read cache, but writes bump the shared data version, so a
+process can mix both APIs.
+
+Usage:
+    from backend import aio
+
+    async def main():
+        task = await aio.add_task("Write report", priority=3)
+        pending = await aio.query_tasks(completed=False, key="deadline")
+        async for task in aio.iter_tasks(key="priority"):
+            ...
+        await aio.dispose()
+"""
+
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
+from functools import wraps
+from itertools import islice, starmap
+import asyncio
+import logging
+
+from sqlalchemy import event, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from . import database, metrics
+from .database import (
+    ROW_COLUMNS,
+    TaskRow,
+    _DELETE_ALL,
+    _DELETE_BY_ID,
+    _HAS_COUNTERS,
+    _INSERT_TASK,
+    _INSERT_TASKS,
+    _MAX_ID,
+    _SELECT_ID,
+    _SELECT_TASK,
+    _apply_sqlite_profile,
+    _bump_version,
+    _delete_tasks_statement,
+    _new_task_values,
+    _page_statements,
+    _query_statement,
+    _search_statement,
+    _stats_from_rows,
+    _stats_statement,
+    _update_statement,
+    _update_tasks_statement,
+    _update_values,
+    day_number,
+)
+
+logger = logging.getLogger(__name__)
+
+# Async engine on the same database file, with the same PRAGMA profile.
+# aiosqlite defaults to opening a connection (and its thread) per checkout,
+# so keep a pool: concurrent readers each hold one connection.
+POOL_SIZE = 8
+
+engine = create_async_engine(
+    f"sqlite+aiosqlite:///{database.DATABASE_PATH}",
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=POOL_SIZE,
+    max_overflow=0,
+)
+event.listen(engine.sync_engine, "connect", _apply_sqlite_profile)
+metrics.track(engine.sync_engine)
+
+
+async def init_db():
+    """
+    Create or upgrade the schema, once per process.
+
+    Shares backend.database.init_db(), which runs the migrations on a
+    worker thread the first time only.
+    """
+    if not database._initialized:
+        await asyncio.to_thread(database.init_db)
+
+
+async def dispose():
+    """Close the pooled connections (call before the event loop ends)."""
+    await engine.dispose()
+
+
+@asynccontextmanager
+async def _connect():
+    """Async counterpart of get_db(): one transaction on a pooled connection."""
+    await init_db()
+    try:
+        async with engine.begin() as conn:
+            yield conn
+    except Exception as e:
+        logger.error("Database error: %s", e)
+        raise
+
+
+def _invalidates(func):
+    """Bump the data version once a write coroutine has finished."""
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            _bump_version()
+
+    return wrapper
+
+
+async def _read_rows(stmt, params=None) -> list:
+    async with _connect() as conn:
+        return list(starmap(TaskRow, await conn.execute(stmt, params)))
+
+
+# =============================================================================
+# CRUD OPERATIONS
+# =============================================================================
+
+
+@metrics.timed
+@_invalidates
+async def add_task(title: str, priority: int = 1, deadline=None) -> dict:
+    """Add a new task. See backend.database.add_task()."""
+    values = _new_task_values(
+        {"title": title, "priority": priority, "deadline": deadline}
+    )
+    async with _connect() as conn:
+        row = (await conn.execute(_INSERT_TASK, values)).one()
+    new_task = TaskRow(*row)
+    logger.debug("Created: %r", new_task)
+    return new_task.to_dict()
+
+
+@metrics.timed
+@_invalidates
+async def add_tasks(tasks, batch_size: int = 1000) -> list:
+    """Add many tasks with batched inserts. See backend.database.add_tasks()."""
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    rows = map(_new_task_values, tasks)
+    new_ids = []
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        async with _connect() as conn:
+            await conn.execute(_INSERT_TASKS, batch)
+            last_id = (await conn.execute(_MAX_ID)).scalar()
+        new_ids.extend(range(last_id - len(batch) + 1, last_id + 1))
+
+    logger.debug("Created %d tasks", len(new_ids))
+    return new_ids
+
+
+@metrics.timed
+async def get_all_tasks() -> list:
+    """Get all tasks from the database."""
+    return await _read_rows(select(*ROW_COLUMNS))
+
+
+@metrics.timed
+async def get_task_by_id(task_id: int):
+    """Get a specific task by ID."""
+    async with _connect() as conn:
+        row = (await conn.execute(_SELECT_TASK, {"task_id": task_id})).first()
+        return TaskRow(*row) if row is not None else None
+
+
+@metrics.timed
+@_invalidates
+async def update_task(task_id: int, **kwargs) -> bool:
+    """Update a task's fields. See backend.database.update_task()."""
+    values = _update_values(kwargs)
+    async with _connect() as conn:
+        if not values:
+            result = await conn.execute(_SELECT_ID, {"task_id": task_id})
+            return result.first() is not None
+        stmt = _update_statement(tuple(sorted(values)))
+        result = await conn.execute(stmt, dict(values, task_id=task_id))
+        if result.rowcount:
+            logger.debug("Updated task %d: %s", task_id, kwargs)
+        return result.rowcount > 0
+
+
+async def mark_task_complete(task_id: int) -> bool:
+    """Mark a task as completed."""
+    return await update_task(task_id, completed=True)
+
+
+async def mark_task_incomplete(task_id: int) -> bool:
+    """Mark a task as not completed."""
+    return await update_task(task_id, completed=False)
+
+
+@metrics.timed
+@_invalidates
+async def update_tasks(ids, **fields) -> list:
+    """Update many tasks with one UPDATE. Returns the IDs updated."""
+    values = _update_values(fields)
+    ids = list(ids)
+    if not ids or not values:
+        return []
+
+    stmt = _update_tasks_statement(ids, values)
+    async with _connect() as conn:
+        updated = list((await conn.execute(stmt)).scalars())
+    logger.debug("Updated %d tasks: %s", len(updated), fields)
+    return updated
+
+
+async def mark_tasks_complete(ids) -> list:
+    """Mark many tasks as completed. Returns the IDs updated."""
+    return await update_tasks(ids, completed=True)
+
+
+async def mark_tasks_incomplete(ids) -> list:
+    """Mark many tasks as not completed. Returns the IDs updated."""
+    return await update_tasks(ids, completed=False)
+
+
+@metrics.timed
+@_invalidates
+async def delete_task(task_id: int) -> bool:
+    """Delete a task by ID. Returns True if it existed."""
+    async with _connect() as conn:
+        result = await conn.execute(_DELETE_BY_ID, {"task_id": task_id})
+        if result.rowcount:
+            logger.debug("Deleted task %d", task_id)
+        return result.rowcount > 0
+
+
+@metrics.timed
+@_invalidates
+async def delete_tasks(ids) -> list:
+    """Delete many tasks with one DELETE. Returns the IDs deleted."""
+    ids = list(ids)
+    if not ids:
+        return []
+
+    stmt = _delete_tasks_statement(ids)
+    async with _connect() as conn:
+        deleted = list((await conn.execute(stmt)).scalars())
+    logger.debug("Deleted %d tasks", len(deleted))
+    return deleted
+
+
+@metrics.timed
+@_invalidates
+async def clear_all_tasks() -> int:
+    """Delete all tasks and compact the file. Returns count deleted."""
+    async with _connect() as conn:
+        count = (await conn.execute(_DELETE_ALL)).rowcount
+        logger.info("Cleared %d tasks", count)
+
+    if count:
+        try:
+            async with engine.connect() as conn:
+                conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+                await conn.exec_driver_sql("VACUUM")
+        except OperationalError as e:
+            logger.warning("Could not compact the database: %s", e)
+    return count
+
+
+@metrics.timed
+async def search_tasks(query: str, mode: str = "substring", limit: int = None) -> list:
+    """Search tasks by title. See backend.database.search_tasks()."""
+    await init_db()
+    return await _read_rows(*_search_statement(query, mode, limit))
+
+
+# =============================================================================
+# QUERIES
+# =============================================================================
+
+
+@metrics.timed
+async def query_tasks(
+    completed: bool = None,
+    priority: int = None,
+    key: str = None,
+    reverse: bool = False,
+    deadline_from=None,
+    deadline_to=None,
+    limit: int = None,
+    offset: int = 0,
+) -> list:
+    """Filter, sort and window tasks. See backend.database.query_tasks()."""
+    return await _read_rows(
+        _query_statement(
+            completed, priority, key, reverse, deadline_from, deadline_to, limit, offset
+        )
+    )
+
+
+@metrics.timed
+async def get_tasks_page(
+    completed: bool = None,
+    priority: int = None,
+    key: str = "id",
+    reverse: bool = False,
+    after=None,
+    limit: int = 200,
+) -> list:
+    """Get one keyset page of tasks. See backend.database.get_tasks_page()."""
+    tasks = []
+    async with _connect() as conn:
+        for stmt in _page_statements(completed, priority, key, reverse, after):
+            if limit is not None:
+                stmt = stmt.limit(limit - len(tasks))
+            tasks.extend(starmap(TaskRow, await conn.execute(stmt)))
+            if limit is not None and len(tasks) >= limit:
+                break
+    return tasks
+
+
+async def iter_tasks(
+    completed: bool = None,
+    priority: int = None,
+    key: str = "id",
+    reverse: bool = False,
+    page_size: int = 500,
+):
+    """
+    Yield every matching task in order, one keyset page at a time.
+
+    Async generator counterpart of backend.database.iter_tasks().
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+
+    after = None
+    while True:
+        page = await get_tasks_page(completed, priority, key, reverse, after, page_size)
+        if page:
+            # Taken before yielding, in case the caller edits the tasks
+            after = (getattr(page[-1], key), page[-1].id)
+        for task in page:
+            yield task
+        if len(page) < page_size:
+            return
+
+
+async def query_overdue_tasks() -> list:
+    """Get incomplete tasks whose deadline has passed, ordered by deadline."""
+    yesterday = date.today() - timedelta(days=1)
+    return await query_tasks(completed=False, key="deadline", deadline_to=yesterday)
+
+
+async def query_tasks_due_soon(days: int = 7) -> list:
+    """Get incomplete tasks due within the next X days, ordered by deadline."""
+    today = date.today()
+    return await query_tasks(
+        completed=False,
+        key="deadline",
+        deadline_from=today,
+        deadline_to=today + timedelta(days=days),
+    )
+
+
+# =============================================================================
+# STATISTICS
+# =============================================================================
+
+
+@metrics.timed
+async def query_task_stats(days: int = 7) -> dict:
+    """Get task statistics in one query. See backend.database.query_task_stats()."""
+    today = day_number(date.today())
+    async with _connect() as conn:
+        counters = (await conn.execute(_HAS_COUNTERS)).first() is not None
+        result = await conn.execute(
+            _stats_statement(counters), {"today": today, "cutoff": today + days}
+        )
+        rows = result.all()
+    return _stats_from_rows(rows)
@@ -0,0 +1,414 @@
+"""
+Client for the ToDoListApp task server.
+Gives the same task functions as backend.database, run over HTTP against
+backend.server, so the app and scripts can share one server's store.
+
+Usage:
+    from backend.client import TaskClient
+
+    client = TaskClient("http://127.0.0.1:8765")
+    task = client.add_task("Write report", priority=3)
+    for task in client.iter_tasks(key="deadline"):
+        ...
+
+Each thread keeps its own keep-alive connection. GET responses are cached
+with their ETags, so repeating a read the server has not seen a write for
+costs a 304 with no body; RemoteChangeWatcher relies on this to poll.
+"""
+
+from collections import OrderedDict
+from datetime import date
+from http import HTTPStatus
+from http.client import HTTPConnection, RemoteDisconnected
+from itertools import islice
+from urllib.parse import urlencode, urlsplit
+import json
+import logging
+import threading
+
+from . import transfer
+from .database import TaskRow
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_URL = "http://127.0.0.1:8765"
+
+
+class TaskServerError(Exception):
+    """The server answered with an error status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Task server error {status}: {message}")
+        self.status = status
+
+
+def _task(record: dict) -> TaskRow:
+    """Build a task from its JSON object."""
+    deadline = record.get("deadline")
+    if deadline is not None:
+        deadline = date.fromisoformat(deadline)
+    return TaskRow(
+        record["id"],
+        record["title"],
+        record["priority"],
+        record["completed"],
+        deadline,
+    )
+
+
+def _json_default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Cannot send {type(value).__name__} to the task server")
+
+
+class TaskClient:
+    """
+    Task operations on a backend.server process.
+
+    Methods take the same arguments and return the same types as their
+    backend.database counterparts (tasks as TaskRow objects with date
+    deadlines), and raise TaskServerError when the server refuses a request.
+    """
+
+    def __init__(
+        self, url: str = DEFAULT_URL, timeout: float = 30, cache_size: int = 256
+    ):
+        """
+        Args:
+            url: Server address, e.g. "http://127.0.0.1:8765"
+            timeout: Seconds to wait for a response
+            cache_size: Number of GET responses kept for conditional requests
+        """
+        parts = urlsplit(url)
+        if parts.scheme != "http" or not parts.hostname:
+            raise ValueError(f"Expected an http:// server URL, got {url!r}")
+        self.url = url
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self.cache_size = cache_size
+        self._local = threading.local()
+        self._etags = OrderedDict()  # path -> (etag, body), least recent first
+        self._etags_lock = threading.Lock()
+
+    # =========================================================================
+    # HTTP
+    # =========================================================================
+
+    def _connection(self) -> HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """Close this thread's connection (it reopens on the next request)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _request(self, method: str, path: str, params=None, body=None):
+        """Send one request and return the decoded JSON response."""
+        if params:
+            path = f"{path}?{urlencode(params)}"
+        headers = {}
+        data = None
+        if body is not None:
+            data = json.dumps(body, default=_json_default).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+
+        cached = None
+        if method == "GET":
+            with self._etags_lock:
+                cached = self._etags.get(path)
+            if cached is not None:
+                headers["If-None-Match"] = cached[0]
+
+        response = self._send(method, path, data, headers)
+        payload = response.read()
+
+        if response.status == HTTPStatus.NOT_MODIFIED and cached is not None:
+            with self._etags_lock:
+                if path in self._etags:
+                    self._etags.move_to_end(path)
+            return cached[1]
+        if response.status >= 400:
+            try:
+                message = json.loads(payload)["error"]
+            except (ValueError, KeyError, TypeError):
+                message = response.reason
+            raise TaskServerError(response.status, message)
+
+        result = json.loads(payload) if payload else None
+        etag = response.getheader("ETag")
+        if method == "GET" and etag and self.cache_size:
+            with self._etags_lock:
+                self._etags[path] = (etag, result)
+                self._etags.move_to_end(path)
+                while len(self._etags) > self.cache_size:
+                    self._etags.popitem(last=False)
+        return result
+
+    def _send(self, method, path, data, headers):
+        conn = self._connection()
+        reused = conn.sock is not None
+        try:
+            conn.request(method, path, data, headers)
+            return conn.getresponse()
+        except (RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+            conn.close()
+            if not reused:
+                raise
+            # The server closed the idle connection before reading this
+            # request; send it again on a fresh one
+            logger.debug("Reconnecting to %s", self.url)
+            conn.request(method, path, data, headers)
+            return conn.getresponse()
+
+    # =========================================================================
+    # CRUD OPERATIONS
+    # =========================================================================
+
+    def add_task(self, title: str, priority: int = 1, deadline=None) -> dict:
+        """Add a new task. Returns it as a dict (deadline as a date)."""
+        record = self._request(
+            "POST",
+            "/tasks",
+            body={"title": title, "priority": priority, "deadline": deadline},
+        )
+        return _task(record).to_dict()
+
+    def add_tasks(self, tasks, batch_size: int = 1000) -> list:
+        """Add many tasks, one request per batch. Returns their IDs in order."""
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        tasks = iter(tasks)
+        new_ids = []
+        while True:
+            batch = list(islice(tasks, batch_size))
+            if not batch:
+                break
+            new_ids.extend(self._request("POST", "/tasks", body=batch)["ids"])
+        return new_ids
+
+    def get_task_by_id(self, task_id: int):
+        """Get a specific task by ID, or None."""
+        try:
+            return _task(self._request("GET", f"/tasks/{int(task_id)}"))
+        except TaskServerError as e:
+            if e.status == HTTPStatus.NOT_FOUND:
+                return None
+            raise
+
+    def update_task(self, task_id: int, **kwargs) -> bool:
+        """Update a task's fields. Returns True if the task exists."""
+        try:
+            self._request("PATCH", f"/tasks/{int(task_id)}", body=kwargs)
+        except TaskServerError as e:
+            if e.status == HTTPStatus.NOT_FOUND:
+                return False
+            raise
+        return True
+
+    def mark_task_complete(self, task_id: int) -> bool:
+        """Mark a task as completed."""
+        return self.update_task(task_id, completed=True)
+
+    def mark_task_incomplete(self, task_id: int) -> bool:
+        """Mark a task as not completed."""
+        return self.update_task(task_id, completed=False)
+
+    def update_tasks(self, ids, **fields) -> list:
+        """Update many tasks in one request. Returns the IDs updated."""
+        body = {"ids": list(ids), "fields": fields}
+        return self._request("POST", "/tasks/update", body=body)["ids"]
+
+    def mark_tasks_complete(self, ids) -> list:
+        """Mark many tasks as completed. Returns the IDs updated."""
+        return self.update_tasks(ids, completed=True)
+
+    def mark_tasks_incomplete(self, ids) -> list:
+        """Mark many tasks as not completed. Returns the IDs updated."""
+        return self.update_tasks(ids, completed=False)
+
+    def delete_task(self, task_id: int) -> bool:
+        """Delete a task by ID. Returns True if it existed."""
+        try:
+            self._request("DELETE", f"/tasks/{int(task_id)}")
+        except TaskServerError as e:
+            if e.status == HTTPStatus.NOT_FOUND:
+                return False
+            raise
+        return True
+
+    def delete_tasks(self, ids) -> list:
+        """Delete many tasks in one request. Returns the IDs deleted."""
+        return self._request("POST", "/tasks/delete", body={"ids": list(ids)})["ids"]
+
+    def clear_all_tasks(self) -> int:
+        """Delete all tasks. Returns count deleted."""
+        return self._request("DELETE", "/tasks")["deleted"]
+
+    def search_tasks(
+        self, query: str, mode: str = "substring", limit: int = None
+    ) -> list:
+        """Search tasks by title. See backend.database.search_tasks()."""
+        params = {"q": query, "mode": mode}
+        if limit is not None:
+            params["limit"] = limit
+        return [_task(record) for record in self._request("GET", "/search", params)]
+
+    # =========================================================================
+    # QUERIES
+    # =========================================================================
+
+    def get_tasks_page(
+        self,
+        completed: bool = None,
+        priority: int = None,
+        key: str = "id",
+        reverse: bool = False,
+        after=None,
+        limit: int = 200,
+    ) -> list:
+        """Get one keyset page of tasks. See backend.database.get_tasks_page()."""
+        if limit is None:
+            # The server always pages; gather the remaining pages here
+            pages = self.iter_tasks(completed, priority, key, reverse, after=after)
+            return list(pages)
+
+        params = {"key": key, "reverse": int(reverse), "limit": limit}
+        if completed is not None:
+            params["completed"] = int(completed)
+        if priority is not None:
+            params["priority"] = priority
+        if after is not None:
+            if not isinstance(after, tuple):
+                after = (getattr(after, key), after.id)
+            params["after"] = json.dumps(after[0], default=_json_default)
+            params["after_id"] = after[1]
+        return [_task(record) for record in self._request("GET", "/tasks", params)]
+
+    def iter_tasks(
+        self,
+        completed: bool = None,
+        priority: int = None,
+        key: str = "id",
+        reverse: bool = False,
+        page_size: int = 500,
+        after=None,
+    ):
+        """Yield every matching task in order, one page request at a time."""
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+
+        while True:
+            page = self.get_tasks_page(
+                completed, priority, key, reverse, after, page_size
+            )
+            if page:
+                after = (getattr(page[-1], key), page[-1].id)
+            yield from page
+            if len(page) < page_size:
+                return
+
+    def query_task_stats(self, days: int = 7) -> dict:
+        """Get task statistics. See backend.database.query_task_stats()."""
+        stats = self._request("GET", "/stats", {"days": days})
+        # JSON object keys are strings; priorities are ints elsewhere. Build
+        # a new dict: the response body is kept for the next 304
+        by_priority = {
+            (int(priority) if priority != "null" else None): count
+            for priority, count in stats["by_priority"].items()
+        }
+        return {**stats, "by_priority": by_priority}
+
+    # =========================================================================
+    # CHANGE TRACKING
+    # =========================================================================
+
+    def change_seq(self) -> int:
+        """Get the sequence number of the latest write to tasks."""
+        return self._request("GET", "/changes")["seq"]
+
+    def get_changes(self, since: int) -> tuple:
+        """Get the tasks written after a sequence number. See database.get_changes()."""
+        changes = self._request("GET", "/changes", {"since": since})
+        tasks = changes["tasks"]
+        if tasks is not None:
+            tasks = [_task(record) for record in tasks]
+        return changes["seq"], tasks, changes["deleted"]
+
+    def watch(self, since: int = None) -> "RemoteChangeWatcher":
+        """Get a watcher for writes made through the server or to its file."""
+        return RemoteChangeWatcher(self, since)
+
+    # =========================================================================
+    # IMPORT / EXPORT
+    # =========================================================================
+
+    def export_tasks(
+        self, path, fmt: str = None, chunk_size: int = 1000, progress=None
+    ) -> int:
+        """Write every task to a local file. See transfer.export_tasks()."""
+        tasks = self.iter_tasks(key="id", page_size=chunk_size)
+        return transfer.export_tasks(path, fmt, chunk_size, progress, tasks=tasks)
+
+    def import_tasks(self, path, batch_size: int = 1000, progress=None) -> int:
+        """
+        Add the tasks from a local export file, skipping duplicate titles.
+
+        Records are sent in batches of ``batch_size``; the server drops
+        titles it already has, like transfer.import_tasks().
+        """
+        added = 0
+        with open(path, "r", encoding="utf-8") as file:
+            records = transfer.iter_import_records(file)
+            while True:
+                batch = list(islice(records, batch_size))
+                if not batch:
+                    break
+                result = self._request("POST", "/tasks/import", body=batch)
+                added += result["added"]
+                if progress is not None:
+                    progress(added)
+
+        logger.info("Imported %d tasks from %s", added, path)
+        return added
+
+
+class RemoteChangeWatcher:
+    """
+    ChangeWatcher counterpart for a task server.
+
+    Each poll() is one conditional GET, answered with an empty 304 until
+    the server has seen a write.
+    """
+
+    def __init__(self, client: TaskClient, since: int = None):
+        self.client = client
+        self.seq = since
+
+    def poll(self):
+        """
+        Check for writes since the last poll.
+
+        Returns:
+            tuple: (tasks, deleted), or None if nothing was written; see
+                ChangeWatcher.poll()
+        """
+        if self.seq is None:
+            self.seq = self.client.change_seq()
+            return None
+        seq, tasks, deleted = self.client.get_changes(self.seq)
+        if seq == self.seq:
+            return None
+        self.seq = seq
+        return tasks, deleted
+
+    def close(self):
+        """Nothing to release; the client owns the connections."""
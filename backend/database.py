@@ -3,11 +3,42 @@ Database module for ToDoListApp.
 Handles all database operations using SQLAlchemy ORM.
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, Boolean
-from sqlalchemy.orm import declarative_base, sessionmaker, scoped_session
+from sqlalchemy import (
+    and_,
+    bindparam,
+    create_engine,
+    delete,
+    event,
+    func,
+    insert,
+    select,
+    text,
+    true,
+    update,
+    Column,
+    Integer,
+    String,
+    Boolean,
+    Index,
+)
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import declarative_base, sessionmaker, scoped_session, validates
+from sqlalchemy.types import TypeDecorator
+from collections import OrderedDict
 from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from functools import wraps
+from itertools import islice, starmap
+import hashlib
+import json
 import os
+import re
 import logging
+import sqlite3
+import threading
+
+from . import metrics
+from .utils import make_task_stats
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -16,13 +47,131 @@ logger = logging.getLogger(__name__)
 # Database configuration
 DATABASE_PATH = os.getenv("TODO_DB_PATH", "tasks.db")
 DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
+DATABASE_PROFILE = os.getenv("TODO_DB_PROFILE", "safe")
+
+# Connection pool: pooled connections, and extra ones opened under load
+# (SQLAlchemy's defaults). The task server sizes these for its threads.
+POOL_SIZE = int(os.getenv("TODO_DB_POOL_SIZE", "5"))
+POOL_OVERFLOW = int(os.getenv("TODO_DB_POOL_OVERFLOW", "10"))
+
+# SQLite PRAGMAs applied to every new connection, per profile.
+# "safe" keeps SQLite's durable defaults, "balanced" uses WAL with fsyncs
+# only at checkpoints, "throughput" trades crash durability for speed.
+SQLITE_PROFILES = {
+    "safe": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "cache_size": -2000,  # KiB when negative
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,  # ms
+    },
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000,
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    "throughput": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -64000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 10000,
+    },
+}
+
+if DATABASE_PROFILE not in SQLITE_PROFILES:
+    raise ValueError(
+        f"Unknown TODO_DB_PROFILE {DATABASE_PROFILE!r}, "
+        f"expected one of {', '.join(SQLITE_PROFILES)}"
+    )
 
 # Create engine
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+engine = create_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    pool_size=POOL_SIZE,
+    max_overflow=POOL_OVERFLOW,
+)
+
+
+@event.listens_for(engine, "connect")
+def _apply_sqlite_profile(dbapi_connection, connection_record):
+    """Apply the configured PRAGMAs to each new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PROFILES[DATABASE_PROFILE].items():
+        cursor.execute(f"PRAGMA {name} = {value}")
+    cursor.close()
+
+
+def get_sqlite_pragmas() -> dict:
+    """
+    Get the PRAGMA values actually in effect on a pooled connection.
+
+    SQLite may refuse a setting (for example WAL on an in-memory database),
+    so this reads them back instead of echoing the profile.
+
+    Returns:
+        dict: PRAGMA name -> current value, plus the active "profile" name
+    """
+    pragmas = {"profile": DATABASE_PROFILE}
+    with engine.connect() as conn:
+        for name in SQLITE_PROFILES[DATABASE_PROFILE]:
+            pragmas[name] = conn.execute(text(f"PRAGMA {name}")).scalar()
+    return pragmas
+
 
 # Base class for models
 Base = declarative_base()
 
+# Day 0 of the integers deadlines are stored as
+EPOCH = date(1970, 1, 1)
+
+
+def day_number(value) -> int:
+    """
+    Convert a date to the number of days since 1970-01-01.
+
+    Args:
+        value: A date, datetime or "YYYY-MM-DD" string
+
+    Raises:
+        ValueError: If a string is not a valid ISO date
+    """
+    if isinstance(value, str):
+        value = date.fromisoformat(value)
+    elif isinstance(value, datetime):
+        value = value.date()
+    return (value - EPOCH).days
+
+
+class DayNumber(TypeDecorator):
+    """
+    A date stored as an INTEGER day number (see day_number()).
+
+    Integers compare and index in date order and take a few bytes, where
+    date strings compare as text. Accepts dates, datetimes and "YYYY-MM-DD"
+    strings (an empty string means no date) and reads back ``date`` objects.
+    """
+
+    impl = Integer
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or value == "":
+            return None
+        return day_number(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return EPOCH + timedelta(days=value)
+
+
 # Thread-safe session factory
 SessionLocal = scoped_session(
     sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -31,110 +180,732 @@ SessionLocal = scoped_session(
 
 class Task(Base):
     """Task model - represents a todo item in the database."""
+
     __tablename__ = "tasks"
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     priority = Column(Integer, default=1)  # 1=Low, 2=Medium, 3=High
     completed = Column(Boolean, default=False)
-    deadline = Column(String, nullable=True)  # Format: "YYYY-MM-DD"
+    deadline = Column(DayNumber, nullable=True)
+    content_hash = Column(Integer, nullable=True)  # content_hash(title)
+
+    # Indexes backing query_tasks() filters, sorts and deadline windows
+    __table_args__ = (
+        Index("ix_tasks_completed_priority", "completed", "priority"),
+        Index("ix_tasks_completed_deadline", "completed", "deadline"),
+        Index("ix_tasks_priority", "priority"),
+        Index("ix_tasks_deadline", "deadline"),
+        Index("ix_tasks_title", "title"),
+        Index("ix_tasks_content_hash", "content_hash"),
+    )
+
+    @validates("title")
+    def _update_content_hash(self, key, title):
+        self.content_hash = content_hash(title)
+        return title
 
     def __repr__(self):
         status = "✓" if self.completed else "○"
         return f"<Task {self.id}: [{status}] {self.title}>"
 
     def to_dict(self):
-        """Convert task to dictionary for JSON export."""
+        """Convert task to a plain dictionary (deadline as a date)."""
         return {
             "id": self.id,
             "title": self.title,
             "priority": self.priority,
             "completed": self.completed,
-            "deadline": self.deadline
+            "deadline": self.deadline,
         }
 
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+class TaskRow:
+    """
+    Lightweight task record returned by the read functions.
+
+    Has the same attributes, repr and to_dict() as Task, but is a plain
+    slotted object built straight from a result row, without the ORM's
+    identity map and attribute instrumentation.
+    """
+
+    __slots__ = ("id", "title", "priority", "completed", "deadline")
+
+    def __init__(self, id, title, priority=1, completed=False, deadline=None):
+        self.id = id
+        self.title = title
+        self.priority = priority
+        self.completed = completed
+        self.deadline = deadline
+
+    __repr__ = Task.__repr__
+    to_dict = Task.to_dict
+
+
+def content_hash(title: str) -> int:
+    """64-bit hash of a task title, used to find duplicates through an index."""
+    digest = hashlib.blake2b(title.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+class SchemaVersion(Base):
+    """One row per schema migration applied to the database file."""
+
+    __tablename__ = "schema_version"
+
+    version = Column(Integer, primary_key=True)
+    applied_at = Column(String, nullable=False)
+
+
+class TaskChange(Base):
+    """
+    Change log: the latest write to each task, numbered in commit order.
+
+    Filled in by triggers on tasks (see _create_change_log()), so writes
+    from any process are recorded. Each task keeps one row, holding the
+    sequence number of its last insert, update or delete; a row whose task
+    no longer exists marks a deletion. AUTOINCREMENT keeps numbers rising
+    even when the newest row is replaced. Entries older than the last
+    CHANGE_LOG_KEEP writes are pruned (see TaskChangeFloor).
+    """
+
+    __tablename__ = "task_changes"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    seq = Column(Integer, primary_key=True)
+    task_id = Column(Integer, nullable=False, unique=True)
+
+
+class TaskChangeFloor(Base):
+    """
+    How far task_changes has been pruned: one row holding the highest
+    sequence number deleted. Changes since an older number are incomplete.
+    """
+
+    __tablename__ = "task_changes_floor"
+
+    id = Column(Integer, primary_key=True)
+    seq = Column(Integer, nullable=False)
+
+
+def _migrate_content_hash(conn):
+    """Version 2: add content_hash and fill it in for existing tasks."""
+    columns = {row[1] for row in conn.execute(text("PRAGMA table_info(tasks)"))}
+    if "content_hash" in columns:
+        return
+    conn.execute(text("ALTER TABLE tasks ADD COLUMN content_hash INTEGER"))
+    count = _fill_content_hashes(conn)
+    logger.info("Added content_hash to %d existing tasks", count)
+
+
+def _fill_content_hashes(conn) -> int:
+    """Hash the titles of tasks whose content_hash is NULL; returns the count."""
+    hashes = [
+        {"id": task_id, "content_hash": content_hash(title)}
+        for task_id, title in conn.execute(
+            text("SELECT id, title FROM tasks WHERE content_hash IS NULL")
+        )
+    ]
+    if hashes:
+        conn.execute(
+            text("UPDATE tasks SET content_hash = :content_hash WHERE id = :id"),
+            hashes,
+        )
+    return len(hashes)
+
+
+def fill_content_hashes() -> int:
+    """
+    Hash titles written without a content_hash, e.g. by raw SQL.
+
+    The ORM and add_tasks() always set it, so this only finds rows written
+    by other tools. Run before matching titles by content_hash.
+
+    Returns:
+        int: Number of tasks updated
+    """
+    init_db()
+    with engine.begin() as conn:
+        return _fill_content_hashes(conn)
+
+
+def _parse_deadline(value):
+    """Day number of a stored "YYYY-MM-DD" string, or None if it is not one."""
+    try:
+        return day_number(value) if isinstance(value, str) else None
+    except ValueError:
+        return None
+
+
+def _migrate_deadline_days(conn):
+    """
+    Version 3: store deadlines as INTEGER day numbers instead of strings.
+
+    SQLite cannot change a column's type, so the table is rebuilt in place:
+    the old one is renamed, a new one created from the model, and every row
+    copied over with its deadline converted. Deadlines that are not valid
+    dates are dropped. Triggers on the old table go with it and are created
+    again by init_db() and here.
+    """
+    had_counters = _has_stats_counters(conn)
+    for name in (
+        "tasks_fts_insert",
+        "tasks_fts_delete",
+        "tasks_fts_update",
+        *_COUNTER_TRIGGERS,
+    ):
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+    conn.execute(text("DROP TABLE IF EXISTS task_counts"))
+    indexes = conn.scalars(
+        text(
+            "SELECT name FROM sqlite_master WHERE type = 'index' "
+            "AND tbl_name = 'tasks' AND sql IS NOT NULL"
+        )
+    ).all()
+    for name in indexes:
+        conn.execute(text(f'DROP INDEX "{name}"'))
+
+    conn.execute(text("ALTER TABLE tasks RENAME TO tasks_old"))
+    Task.__table__.create(bind=conn)
+    conn.connection.driver_connection.create_function(
+        "todo_day_number", 1, _parse_deadline, deterministic=True
+    )
+    conn.execute(
+        text(
+            "INSERT INTO tasks "
+            "(id, title, priority, completed, deadline, content_hash) "
+            "SELECT id, title, priority, completed, todo_day_number(deadline), "
+            "content_hash FROM tasks_old"
+        )
+    )
+    dropped = conn.execute(
+        text(
+            "SELECT COUNT(*) FROM tasks_old WHERE deadline IS NOT NULL "
+            "AND deadline != '' AND todo_day_number(deadline) IS NULL"
+        )
+    ).scalar()
+    conn.execute(text("DROP TABLE tasks_old"))
+
+    if had_counters:
+        _create_stats_counters(conn)
+    if dropped:
+        logger.warning("Dropped %d deadlines that were not valid dates", dropped)
+    logger.info("Converted deadlines to day numbers")
+
+
+# Schema migrations by the version they upgrade to. Files created before
+# schema_version existed count as version 1.
+MIGRATIONS = {
+    2: _migrate_content_hash,
+    3: _migrate_deadline_days,
+}
+SCHEMA_VERSION = max(MIGRATIONS)
+
+
+def _migrate(conn):
+    """Bring the tables up to SCHEMA_VERSION, recording each step."""
+    tables = text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tasks'")
+    existed = conn.execute(tables).first() is not None
+    Base.metadata.create_all(bind=conn)
+
+    version = conn.execute(select(func.max(SchemaVersion.version))).scalar()
+    if version is None:
+        version = 1 if existed else SCHEMA_VERSION
+        if not existed:
+            _record_version(conn, version)
+
+    in_transaction = conn.connection.driver_connection.in_transaction
+    if version < SCHEMA_VERSION and not in_transaction:
+        # pysqlite runs DDL outside of transactions unless one is open, and
+        # a migration that fails halfway must leave the file as it was
+        conn.exec_driver_sql("BEGIN")
+    for target in range(version + 1, SCHEMA_VERSION + 1):
+        logger.info("Migrating database schema to version %d", target)
+        MIGRATIONS[target](conn)
+        _record_version(conn, target)
+
+
+def _record_version(conn, version: int):
+    conn.execute(
+        insert(SchemaVersion.__table__).values(
+            version=version, applied_at=datetime.now().isoformat(timespec="seconds")
+        )
+    )
+
+
+def schema_version() -> int:
+    """Get the schema version of the database file."""
+    init_db()
+    with engine.connect() as conn:
+        return conn.execute(select(func.max(SchemaVersion.version))).scalar()
+
+
+def _create_fts_index() -> bool:
+    """
+    Create the FTS5 title index and the triggers that keep it in sync.
+
+    Returns:
+        bool: True if FTS5 is available, False if searches must use ILIKE
+    """
+    with engine.begin() as conn:
+        existed = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = 'tasks_fts'")
+        ).first()
+        try:
+            conn.execute(
+                text(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5("
+                    "title, content='tasks', content_rowid='id', "
+                    "tokenize='unicode61 remove_diacritics 2')"
+                )
+            )
+        except OperationalError as e:
+            logger.warning("FTS5 unavailable, full-text search disabled: %s", e)
+            return False
+
+        conn.execute(
+            text(
+                "CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks "
+                "BEGIN "
+                "INSERT INTO tasks_fts(rowid, title) VALUES (new.id, new.title); "
+                "END"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks "
+                "BEGIN "
+                "INSERT INTO tasks_fts(tasks_fts, rowid, title) "
+                "VALUES ('delete', old.id, old.title); "
+                "END"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE TRIGGER IF NOT EXISTS tasks_fts_update "
+                "AFTER UPDATE OF title ON tasks "
+                "BEGIN "
+                "INSERT INTO tasks_fts(tasks_fts, rowid, title) "
+                "VALUES ('delete', old.id, old.title); "
+                "INSERT INTO tasks_fts(rowid, title) VALUES (new.id, new.title); "
+                "END"
+            )
+        )
+        if not existed:
+            # Index titles that were written before the FTS table existed
+            conn.execute(text("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')"))
+    return True
+
+
+# Set by init_db(): whether search_tasks() can use the FTS5 index
+FTS_AVAILABLE = None
+
+_initialized = False
+_init_lock = threading.Lock()
+
+
+def init_db():
+    """
+    Create or upgrade the schema. Runs once, on first use of the database.
+
+    Deferring this keeps ``import backend.database`` cheap; every function
+    that talks to the database calls it first.
+    """
+    global FTS_AVAILABLE, _initialized
+    if _initialized:
+        return
+    with _init_lock:
+        if _initialized:
+            return
+
+        # Create tables, then upgrade files written by older versions
+        with engine.begin() as conn:
+            _migrate(conn)
+
+            # create_all() skips indexes on tables that already exist
+            for index in Task.__table__.indexes:
+                index.create(bind=conn, checkfirst=True)
+            _create_change_log(conn)
+
+        FTS_AVAILABLE = _create_fts_index()
+        _initialized = True
+
+
+# Columns read into TaskRow, in constructor order
+ROW_COLUMNS = (Task.id, Task.title, Task.priority, Task.completed, Task.deadline)
+
+# Fields update_tasks() is allowed to change
+UPDATABLE_FIELDS = ("title", "priority", "completed", "deadline")
+
+# Columns query_tasks() is allowed to sort by
+SORT_KEYS = {
+    "id": Task.id,
+    "title": Task.title,
+    "priority": Task.priority,
+    "deadline": Task.deadline,
+}
 
 
 @contextmanager
 def get_db():
     """Context manager for database sessions."""
+    init_db()
     db = SessionLocal()
     try:
         yield db
         db.commit()
     except Exception as e:
         db.rollback()
-        logger.error(f"Database error: {e}")
+        logger.error("Database error: %s", e)
         raise
     finally:
         db.close()
 
 
+# =============================================================================
+# READ CACHE
+# =============================================================================
+
+_MISSING = object()
+
+# Bumped after every write; cache entries from older versions are stale
+_data_version = 0
+_version_lock = threading.Lock()
+
+# The active ReadCache, or None while caching is off
+_cache = None
+
+
+class ReadCache:
+    """
+    Bounded LRU cache for read results, invalidated by the data version.
+
+    Each entry remembers the data version it was read at and is only served
+    while no write has happened since. Task lookups by ID and query results
+    are kept in separate LRUs so large query results cannot push out every
+    single-task entry.
+    """
+
+    def __init__(self, max_tasks: int = 4096, max_queries: int = 256):
+        self.max_tasks = max_tasks
+        self.max_queries = max_queries
+        self.hits = 0
+        self.misses = 0
+        self._tasks = OrderedDict()
+        self._queries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, kind: str, key):
+        """Return a fresh cached value, or _MISSING."""
+        entries = self._tasks if kind == "task" else self._queries
+        with self._lock:
+            entry = entries.get(key)
+            if entry is not None and entry[0] == _data_version:
+                entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return _MISSING
+
+    def put(self, kind: str, key, version: int, value):
+        """Store a value read at the given data version."""
+        if kind == "task":
+            entries, limit = self._tasks, self.max_tasks
+        else:
+            entries, limit = self._queries, self.max_queries
+        with self._lock:
+            entries[key] = (version, value)
+            entries.move_to_end(key)
+            while len(entries) > limit:
+                entries.popitem(last=False)
+
+    def refresh(self, old: int, new: int, changed: set):
+        """
+        Carry task entries across a version bump for other processes' writes.
+
+        Entries that were fresh at version ``old`` stay fresh at ``new``
+        unless they hold a task in ``changed`` or a lookup that found no
+        task (which may exist now). Query results are dropped.
+        """
+        with self._lock:
+            for key, (version, task) in list(self._tasks.items()):
+                if version != old:
+                    continue
+                if task is None or task.id in changed:
+                    del self._tasks[key]
+                else:
+                    self._tasks[key] = (new, task)
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._tasks.clear()
+            self._queries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Get hit/miss counters and current sizes."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "version": _data_version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups * 100, 1) if lookups else 0.0,
+                "tasks": len(self._tasks),
+                "queries": len(self._queries),
+            }
+
+
+def enable_cache(max_tasks: int = 4096, max_queries: int = 256) -> ReadCache:
+    """
+    Turn on the read cache for get_all_tasks, get_task_by_id, search_tasks
+    and query_tasks.
+
+    Cached results are shared between callers, so treat returned tasks as
+    read-only.
+
+    Args:
+        max_tasks: Maximum number of tasks cached by ID
+        max_queries: Maximum number of cached query results
+
+    Returns:
+        ReadCache: The active cache
+    """
+    global _cache
+    _cache = ReadCache(max_tasks, max_queries)
+    return _cache
+
+
+def disable_cache():
+    """Turn off the read cache and drop its entries."""
+    global _cache
+    _cache = None
+
+
+def cache_stats() -> dict:
+    """Get read cache statistics, or an empty dict when caching is off."""
+    return _cache.stats() if _cache is not None else {}
+
+
+def data_version() -> int:
+    """Get the in-process data version, bumped after every write."""
+    return _data_version
+
+
+def _bump_version():
+    global _data_version
+    with _version_lock:
+        _data_version += 1
+
+
+def _invalidates(func):
+    """Bump the data version once a write function has finished."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _bump_version()
+
+    return wrapper
+
+
+def _cached(kind: str):
+    """Serve a read function from the cache when it is enabled."""
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            cache = _cache
+            if cache is None:
+                return func(*args, **kwargs)
+
+            key = (func.__name__, args, tuple(sorted(kwargs.items())))
+            value = cache.get(kind, key)
+            if value is _MISSING:
+                # Stamp with the version seen before reading, so a write
+                # that lands mid-read leaves the entry stale
+                version = _data_version
+                value = func(*args, **kwargs)
+                cache.put(kind, key, version, value)
+            return list(value) if isinstance(value, list) else value
+
+        return wrapper
+
+    return decorator
+
+
 # =============================================================================
 # CRUD OPERATIONS
 # =============================================================================
 
-def add_task(title: str, priority: int = 1, deadline: str = None) -> dict:
+
+def _read_rows(stmt, params=None) -> list:
+    """Run a SELECT of ROW_COLUMNS on the Core connection and build TaskRows."""
+    with get_db() as db:
+        return list(starmap(TaskRow, db.connection().execute(stmt, params)))
+
+
+# Reads the stored row back, so deadlines come back as dates
+_INSERT_TASK = insert(Task.__table__).returning(*ROW_COLUMNS)
+
+# Plain executemany without RETURNING: SQLite cannot return generated IDs
+# in parameter order, so SQLAlchemy would send one INSERT per row. New
+# rowids are max(id) + 1 in insert order, and the transaction holds the
+# write lock, so a batch's rows are the top len(batch) IDs.
+_INSERT_TASKS = insert(Task.__table__)
+_MAX_ID = select(func.max(Task.id))
+
+
+def _new_task_values(task: dict) -> dict:
+    """Column values for a new task given as a dict like add_tasks() takes."""
+    return {
+        "title": task["title"],
+        "priority": task.get("priority", 1),
+        "completed": bool(task.get("completed", False)),
+        "deadline": task.get("deadline"),
+        "content_hash": content_hash(task["title"]),
+    }
+
+
+@metrics.timed
+@_invalidates
+def add_task(title: str, priority: int = 1, deadline=None) -> dict:
     """
     Add a new task to the database.
-    
+
     Args:
         title: Task title (required)
         priority: 1=Low, 2=Medium, 3=High (default: 1)
-        deadline: Due date as "YYYY-MM-DD" string (optional)
-    
+        deadline: Due date as a date or "YYYY-MM-DD" string (optional)
+
     Returns:
         dict: The created task
     """
+    values = _new_task_values(
+        {"title": title, "priority": priority, "deadline": deadline}
+    )
     with get_db() as db:
-        new_task = Task(title=title, priority=priority, deadline=deadline)
-        db.add(new_task)
-        db.flush()
-        logger.info(f"Created: {new_task}")
-        return new_task.to_dict()
+        row = db.connection().execute(_INSERT_TASK, values).one()
+    new_task = TaskRow(*row)
+    logger.debug("Created: %r", new_task)
+    return new_task.to_dict()
+
+
+@metrics.timed
+@_invalidates
+def add_tasks(tasks, batch_size: int = 1000) -> list:
+    """
+    Add many tasks at once using batched inserts.
 
+    Each chunk of ``batch_size`` tasks is written with a single executemany
+    INSERT inside one transaction, instead of one transaction per task.
 
+    Args:
+        tasks: Iterable of dicts with "title" and optional "priority",
+            "deadline" and "completed" keys
+        batch_size: Number of tasks inserted per transaction (default: 1000)
+
+    Returns:
+        list: IDs of the created tasks, in input order
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    rows = map(_new_task_values, tasks)
+    new_ids = []
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        with get_db() as db:
+            conn = db.connection()
+            conn.execute(_INSERT_TASKS, batch)
+            last_id = conn.execute(_MAX_ID).scalar()
+        new_ids.extend(range(last_id - len(batch) + 1, last_id + 1))
+
+    logger.debug("Created %d tasks", len(new_ids))
+    return new_ids
+
+
+@metrics.timed
+@_cached("query")
 def get_all_tasks() -> list:
     """Get all tasks from the database."""
-    with get_db() as db:
-        tasks = db.query(Task).all()
-        # Detach from session
-        db.expunge_all()
-        return tasks
+    return _read_rows(select(*ROW_COLUMNS))
 
 
+@metrics.timed
+@_cached("task")
 def get_task_by_id(task_id: int):
     """Get a specific task by ID."""
     with get_db() as db:
-        task = db.query(Task).filter(Task.id == task_id).first()
-        if task:
-            db.expunge(task)
-        return task
+        row = db.connection().execute(_SELECT_TASK, {"task_id": task_id}).first()
+        return TaskRow(*row) if row is not None else None
+
+
+def _update_values(fields: dict) -> dict:
+    """Check field names and add the columns derived from them."""
+    unknown = set(fields) - set(UPDATABLE_FIELDS)
+    if unknown:
+        raise ValueError(f"Cannot update task fields: {', '.join(sorted(unknown))}")
+    values = dict(fields)
+    if "completed" in values:
+        values["completed"] = bool(values["completed"])
+    if "title" in values:
+        values["content_hash"] = content_hash(values["title"])
+    return values
 
 
+# Single-task write statements, built once. Values are bound by column
+# name, so one UPDATE per combination of fields is enough.
+_SELECT_ID = select(Task.id).where(Task.id == bindparam("task_id"))
+_SELECT_TASK = select(*ROW_COLUMNS).where(Task.id == bindparam("task_id"))
+_DELETE_BY_ID = delete(Task.__table__).where(Task.id == bindparam("task_id"))
+_update_statements = {}
+
+
+def _update_statement(columns: tuple):
+    """Get the cached UPDATE ... WHERE id = :task_id for the given columns."""
+    stmt = _update_statements.get(columns)
+    if stmt is None:
+        stmt = _update_statements[columns] = (
+            update(Task.__table__)
+            .where(Task.id == bindparam("task_id"))
+            .values({column: bindparam(column) for column in columns})
+        )
+    return stmt
+
+
+@metrics.timed
+@_invalidates
 def update_task(task_id: int, **kwargs) -> bool:
     """
-    Update a task's fields.
-    
+    Update a task's fields with a single UPDATE statement.
+
     Args:
         task_id: ID of task to update
         **kwargs: Fields to update (title=, priority=, deadline=, completed=)
-    
+
     Returns:
-        bool: True if successful
+        bool: True if the task exists
+
+    Raises:
+        ValueError: If a field is not one of UPDATABLE_FIELDS
     """
+    values = _update_values(kwargs)
     with get_db() as db:
-        task = db.query(Task).filter(Task.id == task_id).first()
-        if task:
-            for key, value in kwargs.items():
-                if hasattr(task, key):
-                    setattr(task, key, value)
-            logger.info(f"Updated task {task_id}: {kwargs}")
-            return True
-        return False
+        conn = db.connection()
+        if not values:
+            return conn.execute(_SELECT_ID, {"task_id": task_id}).first() is not None
+        stmt = _update_statement(tuple(sorted(values)))
+        result = conn.execute(stmt, dict(values, task_id=task_id))
+        if result.rowcount:
+            logger.debug("Updated task %d: %s", task_id, kwargs)
+        return result.rowcount > 0
 
 
 def mark_task_complete(task_id: int) -> bool:
@@ -147,28 +918,767 @@ def mark_task_incomplete(task_id: int) -> bool:
     return update_task(task_id, completed=False)
 
 
+def _id_list(ids):
+    """
+    Subquery yielding the given IDs from a single JSON parameter, so any
+    number of IDs is one bound value and one cached statement.
+    """
+    values = func.json_each(json.dumps([int(task_id) for task_id in ids]))
+    return select(values.table_valued("value").c.value)
+
+
+def _update_tasks_statement(ids, values: dict):
+    return (
+        update(Task.__table__)
+        .where(Task.id.in_(_id_list(ids)))
+        .values(**values)
+        .returning(Task.id)
+    )
+
+
+def _delete_tasks_statement(ids):
+    return delete(Task.__table__).where(Task.id.in_(_id_list(ids))).returning(Task.id)
+
+
+@metrics.timed
+@_invalidates
+def update_tasks(ids, **fields) -> list:
+    """
+    Update the same fields on many tasks with one UPDATE statement.
+
+    Args:
+        ids: IDs of the tasks to update
+        **fields: Fields to update (title=, priority=, deadline=, completed=)
+
+    Returns:
+        list: IDs of the tasks that exist and were updated
+    """
+    values = _update_values(fields)
+    ids = list(ids)
+    if not ids or not values:
+        return []
+
+    stmt = _update_tasks_statement(ids, values)
+    with get_db() as db:
+        updated = list(db.connection().execute(stmt).scalars())
+    logger.debug("Updated %d tasks: %s", len(updated), fields)
+    return updated
+
+
+def mark_tasks_complete(ids) -> list:
+    """Mark many tasks as completed. Returns the IDs updated."""
+    return update_tasks(ids, completed=True)
+
+
+def mark_tasks_incomplete(ids) -> list:
+    """Mark many tasks as not completed. Returns the IDs updated."""
+    return update_tasks(ids, completed=False)
+
+
+@metrics.timed
+@_invalidates
 def delete_task(task_id: int) -> bool:
-    """Delete a task by ID."""
+    """Delete a task by ID. Returns True if it existed."""
     with get_db() as db:
-        task = db.query(Task).filter(Task.id == task_id).first()
-        if task:
-            db.delete(task)
-            logger.info(f"Deleted task {task_id}")
-            return True
-        return False
+        result = db.connection().execute(_DELETE_BY_ID, {"task_id": task_id})
+        if result.rowcount:
+            logger.debug("Deleted task %d", task_id)
+        return result.rowcount > 0
 
 
+@metrics.timed
+@_invalidates
+def delete_tasks(ids) -> list:
+    """
+    Delete many tasks with one DELETE statement.
+
+    Args:
+        ids: IDs of the tasks to delete
+
+    Returns:
+        list: IDs of the tasks that existed and were deleted
+    """
+    ids = list(ids)
+    if not ids:
+        return []
+
+    stmt = _delete_tasks_statement(ids)
+    with get_db() as db:
+        deleted = list(db.connection().execute(stmt).scalars())
+    logger.debug("Deleted %d tasks", len(deleted))
+    return deleted
+
+
+_DELETE_ALL = delete(Task.__table__)
+
+
+@metrics.timed
+@_invalidates
 def clear_all_tasks() -> int:
     """Delete all tasks. Returns count deleted."""
     with get_db() as db:
-        count = db.query(Task).delete()
-        logger.info(f"Cleared {count} tasks")
-        return count
+        count = db.connection().execute(_DELETE_ALL).rowcount
+        logger.info("Cleared %d tasks", count)
+
+    if count:
+        # Rebuilding the now empty file is cheap. Left alone, its free pages
+        # make every later insert into the FTS index several times slower.
+        try:
+            with engine.connect() as conn:
+                conn.execution_options(isolation_level="AUTOCOMMIT").exec_driver_sql(
+                    "VACUUM"
+                )
+        except OperationalError as e:
+            logger.warning("Could not compact the database: %s", e)
+    return count
+
+
+@metrics.timed
+@_cached("query")
+def search_tasks(query: str, mode: str = "substring", limit: int = None) -> list:
+    """
+    Search tasks by title.
+
+    Args:
+        query: Text to look for
+        mode: "substring" matches anywhere in the title (case-insensitive);
+            "fulltext" matches words by prefix through the FTS5 index and
+            returns the most relevant tasks first. Falls back to
+            "substring" when FTS5 is not available.
+        limit: Maximum number of tasks to return (optional)
+
+    Returns:
+        list: Matching tasks
+    """
+    init_db()
+    return _read_rows(*_search_statement(query, mode, limit))
+
+
+def _search_statement(query: str, mode: str, limit: int):
+    """Build the search_tasks() query. Returns (statement, parameters)."""
+    if mode not in ("substring", "fulltext"):
+        raise ValueError(f"Unknown search mode {mode!r}")
+
+    terms = re.findall(r"\w+", query)
+    if mode == "fulltext" and FTS_AVAILABLE and terms:
+        # Every word must match, each one as a prefix
+        match = " ".join(f'"{term}"*' for term in terms)
+        stmt = text(
+            "SELECT tasks.id, tasks.title, tasks.priority, tasks.completed, "
+            "tasks.deadline FROM tasks_fts "
+            "JOIN tasks ON tasks.id = tasks_fts.rowid "
+            "WHERE tasks_fts MATCH :match ORDER BY tasks_fts.rank, tasks.id"
+            + (" LIMIT :limit" if limit is not None else "")
+        ).columns(*ROW_COLUMNS)
+        params = {"match": match}
+        if limit is not None:
+            params["limit"] = limit
+        return stmt, params
+
+    stmt = select(*ROW_COLUMNS).where(Task.title.ilike(f"%{query}%"))
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt, None
+
+
+# =============================================================================
+# QUERIES
+# =============================================================================
+
+
+@metrics.timed
+@_cached("query")
+def query_tasks(
+    completed: bool = None,
+    priority: int = None,
+    key: str = None,
+    reverse: bool = False,
+    deadline_from=None,
+    deadline_to=None,
+    limit: int = None,
+    offset: int = 0,
+) -> list:
+    """
+    Filter, sort and window tasks in SQL.
+
+    Takes the same filter and sort parameters as ``utils.filter_tasks`` and
+    ``utils.sort_tasks`` but lets SQLite do the work on the indexed columns,
+    so only the matching rows are loaded.
+
+    Args:
+        completed: True/False/None (None = don't filter)
+        priority: 1/2/3/None (None = don't filter)
+        key: Attribute to sort by ("priority", "title", "deadline", "id");
+            ties are broken by ID
+        reverse: True for descending order (ties by descending ID)
+        deadline_from: Earliest deadline, inclusive, as a date or
+            "YYYY-MM-DD" (optional)
+        deadline_to: Latest deadline, inclusive (optional)
+        limit: Maximum number of tasks to return (optional)
+        offset: Number of matching tasks to skip (default: 0)
+
+    Returns:
+        list: Matching tasks
+    """
+    return _read_rows(
+        _query_statement(
+            completed, priority, key, reverse, deadline_from, deadline_to, limit, offset
+        )
+    )
+
+
+def _query_statement(
+    completed, priority, key, reverse, deadline_from, deadline_to, limit, offset
+):
+    """Build the query_tasks() SELECT."""
+    if key is not None and key not in SORT_KEYS:
+        raise ValueError(f"Cannot sort tasks by {key!r}")
+
+    stmt = select(*ROW_COLUMNS)
+    if completed is not None:
+        stmt = stmt.where(Task.completed == completed)
+    if priority is not None:
+        stmt = stmt.where(Task.priority == priority)
+    if deadline_from is not None:
+        stmt = stmt.where(Task.deadline >= deadline_from)
+    if deadline_to is not None:
+        stmt = stmt.where(Task.deadline <= deadline_to)
+    if key is not None:
+        column = SORT_KEYS[key]
+        # (key, id) order, descending as a whole when reversed, like
+        # get_tasks_page() and utils.sort_tasks()
+        if reverse:
+            stmt = stmt.order_by(column.desc(), Task.id.desc())
+        else:
+            stmt = stmt.order_by(column.asc(), Task.id)
+    if offset:
+        stmt = stmt.offset(offset)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+
+    return stmt
+
+
+def _keyset_segments(column, reverse: bool, after):
+    """
+    WHERE clauses selecting the rows after ``after`` in (column, id) order,
+    one per index range, in the order the ranges come.
+
+    Each clause is a single seek into the column's index (which ends with
+    the ID), so a page never scans the rows before ``after``. SQLite puts
+    NULLs first in ascending order and last in descending order.
+    """
+    if column is Task.id:
+        if after is None:
+            return [true()]
+        return [Task.id < after[1]] if reverse else [Task.id > after[1]]
+
+    nulls = [column.is_(None)] if column.nullable else []
+    if after is None:
+        return (
+            [column.is_not(None)] + nulls if reverse else nulls + [column.is_not(None)]
+        )
+
+    value, task_id = after
+    if value is None:
+        if reverse:
+            return [and_(column.is_(None), Task.id < task_id)]
+        return [and_(column.is_(None), Task.id > task_id), column.is_not(None)]
+    if reverse:
+        return [and_(column == value, Task.id < task_id), column < value] + nulls
+    return [and_(column == value, Task.id > task_id), column > value]
+
+
+@metrics.timed
+def get_tasks_page(
+    completed: bool = None,
+    priority: int = None,
+    key: str = "id",
+    reverse: bool = False,
+    after=None,
+    limit: int = 200,
+) -> list:
+    """
+    Get one page of tasks using keyset pagination.
+
+    Tasks are ordered by (sort key, id), and instead of skipping ``offset``
+    rows each page starts right after the last task of the previous one by
+    seeking into the sort key's index. Every page costs the same however
+    deep it is, and tasks added or deleted before the current position do
+    not shift later pages.
+
+    Args:
+        completed: True/False/None (None = don't filter)
+        priority: 1/2/3/None (None = don't filter)
+        key: Attribute to sort by ("id", "priority", "title", "deadline")
+        reverse: True to order by (sort key, id) descending
+        after: Last task of the previous page, or its (sort value, id)
+            pair; None for the first page
+        limit: Maximum number of tasks to return (None = all remaining)
+
+    Returns:
+        list: The next tasks in order
+    """
+    tasks = []
+    with get_db() as db:
+        conn = db.connection()
+        for stmt in _page_statements(completed, priority, key, reverse, after):
+            if limit is not None:
+                stmt = stmt.limit(limit - len(tasks))
+            tasks.extend(starmap(TaskRow, conn.execute(stmt)))
+            if limit is not None and len(tasks) >= limit:
+                break
+    return tasks
+
+
+def _page_statements(completed, priority, key, reverse, after):
+    """
+    Build the get_tasks_page() SELECTs, one per keyset segment, to run in
+    order until a page is full.
+    """
+    if key not in SORT_KEYS:
+        raise ValueError(f"Cannot sort tasks by {key!r}")
+    column = SORT_KEYS[key]
+    if after is not None and not isinstance(after, tuple):
+        after = (getattr(after, key), after.id)
+
+    # The filters match a large share of the tasks, so tell the planner
+    # (which has no statistics) to walk the sort key's index and filter,
+    # rather than collect every match and sort it for each page
+    stmt = select(*ROW_COLUMNS)
+    if completed is not None:
+        stmt = stmt.where(func.likely(Task.completed == completed))
+    if priority is not None:
+        stmt = stmt.where(
+            Task.priority == priority
+            if column is Task.priority
+            else func.likely(Task.priority == priority)
+        )
+    if column is Task.id:
+        stmt = stmt.order_by(Task.id.desc() if reverse else Task.id)
+    elif reverse:
+        stmt = stmt.order_by(column.desc(), Task.id.desc())
+    else:
+        stmt = stmt.order_by(column, Task.id)
+
+    return [stmt.where(segment) for segment in _keyset_segments(column, reverse, after)]
+
+
+def iter_tasks(
+    completed: bool = None,
+    priority: int = None,
+    key: str = "id",
+    reverse: bool = False,
+    page_size: int = 500,
+):
+    """
+    Yield every matching task in order, one keyset page at a time.
+
+    Only one page is held in memory, and each page is read in its own short
+    transaction, so writers are not blocked while a caller works through a
+    large result.
+
+    Args:
+        completed: True/False/None (None = don't filter)
+        priority: 1/2/3/None (None = don't filter)
+        key: Attribute to sort by ("id", "priority", "title", "deadline")
+        reverse: True to order by (sort key, id) descending
+        page_size: Number of tasks read per query
+
+    Yields:
+        TaskRow: Tasks in (sort key, id) order
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+
+    after = None
+    while True:
+        page = get_tasks_page(completed, priority, key, reverse, after, page_size)
+        if page:
+            # Taken before yielding, in case the caller edits the tasks
+            after = (getattr(page[-1], key), page[-1].id)
+        yield from page
+        if len(page) < page_size:
+            return
+
+
+def query_overdue_tasks() -> list:
+    """Get incomplete tasks whose deadline has passed, ordered by deadline."""
+    yesterday = date.today() - timedelta(days=1)
+    return query_tasks(completed=False, key="deadline", deadline_to=yesterday)
+
+
+def query_tasks_due_soon(days: int = 7) -> list:
+    """Get incomplete tasks due within the next X days, ordered by deadline."""
+    today = date.today()
+    return query_tasks(
+        completed=False,
+        key="deadline",
+        deadline_from=today,
+        deadline_to=today + timedelta(days=days),
+    )
+
+
+# =============================================================================
+# CHANGE TRACKING
+# =============================================================================
+
+# Triggers that number every write to tasks in task_changes. Writers hold
+# SQLite's write lock, so sequence numbers increase in commit order across
+# processes.
+# The change log keeps the entries of the last CHANGE_LOG_KEEP writes;
+# every CHANGE_LOG_PRUNE_EVERY writes, a trigger deletes the older ones
+CHANGE_LOG_KEEP = 10000
+CHANGE_LOG_PRUNE_EVERY = 1000
+
+_CHANGE_LOG_TRIGGERS = {
+    "task_changes_insert": ("AFTER INSERT ON tasks", "new"),
+    "task_changes_update": ("AFTER UPDATE ON tasks", "new"),
+    "task_changes_delete": ("AFTER DELETE ON tasks", "old"),
+}
+
+
+def _create_change_log(conn):
+    """Create the triggers that fill task_changes, if they do not exist."""
+    for name, (event_sql, row) in _CHANGE_LOG_TRIGGERS.items():
+        conn.execute(
+            text(
+                f"CREATE TRIGGER IF NOT EXISTS {name} {event_sql} BEGIN "
+                f"INSERT OR REPLACE INTO task_changes (task_id) VALUES ({row}.id); "
+                "END"
+            )
+        )
+    conn.execute(
+        text(
+            "CREATE TRIGGER IF NOT EXISTS task_changes_prune "
+            "AFTER INSERT ON task_changes "
+            f"WHEN new.seq % {CHANGE_LOG_PRUNE_EVERY} = 0 "
+            f"AND new.seq > {CHANGE_LOG_KEEP} BEGIN "
+            f"DELETE FROM task_changes WHERE seq <= new.seq - {CHANGE_LOG_KEEP}; "
+            "INSERT OR REPLACE INTO task_changes_floor (id, seq) "
+            f"VALUES (1, new.seq - {CHANGE_LOG_KEEP}); "
+            "END"
+        )
+    )
+
+
+_CHANGE_SEQ = select(func.max(TaskChange.seq))
+_CHANGE_FLOOR = select(TaskChangeFloor.seq)
+_CHANGES = (
+    select(TaskChange.seq, TaskChange.task_id, *ROW_COLUMNS)
+    .select_from(
+        TaskChange.__table__.outerjoin(Task.__table__, Task.id == TaskChange.task_id)
+    )
+    .where(TaskChange.seq > bindparam("since"))
+    .order_by(TaskChange.seq)
+)
+
+
+def change_seq() -> int:
+    """Get the sequence number of the latest write to tasks (0 if none)."""
+    with get_db() as db:
+        return db.connection().execute(_CHANGE_SEQ).scalar() or 0
+
+
+@metrics.timed
+def get_changes(since: int) -> tuple:
+    """
+    Get the tasks written after a change sequence number.
+
+    Reads only the change log entries past ``since`` (through the index on
+    seq) and the rows they point to, so catching up costs the number of
+    tasks that changed, not the number of tasks.
+
+    The log only keeps the last CHANGE_LOG_KEEP writes. When entries past
+    ``since`` have been pruned, ``tasks`` is None instead: the caller has
+    missed changes and must read everything again.
+
+    Args:
+        since: Sequence number seen last, from change_seq() or a previous call
+
+    Returns:
+        tuple: (seq, tasks, deleted) - the sequence number to pass next
+            time, the changed tasks that still exist (or None), and the IDs
+            of deleted tasks
+    """
+    tasks = []
+    deleted = []
+    seq = since
+    with get_db() as db:
+        conn = db.connection()
+        for row in conn.execute(_CHANGES, {"since": since}):
+            seq = row[0]
+            if row[2] is None:
+                deleted.append(row[1])
+            else:
+                tasks.append(TaskRow(*row[2:]))
+        # Checked after reading, so a prune that ran meanwhile is noticed
+        if since < (conn.execute(_CHANGE_FLOOR).scalar() or 0):
+            return conn.execute(_CHANGE_SEQ).scalar() or 0, None, []
+    return seq, tasks, deleted
+
+
+def _apply_changes(tasks, deleted):
+    """Bump the data version and keep cached tasks that did not change."""
+    global _data_version
+    with _version_lock:
+        old = _data_version
+        _data_version += 1
+        cache = _cache
+        if cache is not None and tasks is not None:
+            changed = {task.id for task in tasks}
+            changed.update(deleted)
+            cache.refresh(old, _data_version, changed)
+
+
+class ChangeWatcher:
+    """
+    Notices writes to the database file by other connections and processes.
+
+    poll() runs ``PRAGMA data_version`` on a connection of its own. SQLite
+    changes that value whenever another connection commits, so a poll that
+    finds nothing costs one PRAGMA and no table reads. When it has changed,
+    poll() reads the change log past the last sequence number it has seen.
 
+    Usage:
+        watcher = ChangeWatcher(since=change_seq())  # Before the first read
+        ...
+        changes = watcher.poll()  # e.g. from a timer
+        if changes is not None:
+            tasks, deleted = changes
+    """
+
+    def __init__(self, since: int = None):
+        """
+        Args:
+            since: Sequence number to report changes after, taken before
+                the caller first reads the tasks (default: the latest one
+                at the first poll, which misses writes made until then)
+        """
+        self.seq = since
+        self._conn = None
+        self._data_version = None
+        self._lock = threading.Lock()
+
+    def poll(self):
+        """
+        Check for writes since the last poll.
+
+        Also brings the read cache and the data version up to date, so
+        cached reads and ETags reflect other processes' writes.
+
+        Returns:
+            tuple: (tasks, deleted) - changed tasks that still exist and
+                IDs of deleted tasks - or None if nothing was written.
+                ``tasks`` is None if the change log was pruned past the
+                last poll; everything should be read again then.
+        """
+        with self._lock:
+            if self._conn is None:
+                init_db()
+                # A short timeout: a poll that finds the file busy with a
+                # commit just tries again next time
+                self._conn = sqlite3.connect(
+                    DATABASE_PATH, timeout=0.1, check_same_thread=False
+                )
+            try:
+                version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            except sqlite3.OperationalError as e:
+                logger.debug("Change poll skipped: %s", e)
+                return None
+            if self.seq is None:
+                self.seq = change_seq()
+                self._data_version = version
+                return None
+            if version == self._data_version:
+                return None
+
+            seq, tasks, deleted = get_changes(self.seq)
+            # The version read before get_changes(): a commit that lands
+            # during the read changes it again, so the next poll sees it
+            self._data_version = version
+            if seq == self.seq:
+                return None
+            self.seq = seq
+        _apply_changes(tasks, deleted)
+        if tasks is None:
+            logger.info("Missed changes pruned from the change log")
+        else:
+            logger.debug("%d tasks changed, %d deleted", len(tasks), len(deleted))
+        return tasks, deleted
+
+    def close(self):
+        """Close the watcher's connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# =============================================================================
+# STATISTICS
+# =============================================================================
+
+# One aggregate per priority over either the tasks table (one row per task)
+# or the task_counts table (one row per priority/completed/deadline group)
+_STATS_SQL = (
+    "SELECT priority, SUM({n}), "
+    "SUM(CASE WHEN completed THEN {n} ELSE 0 END), "
+    "SUM(CASE WHEN NOT completed AND deadline < :today THEN {n} ELSE 0 END), "
+    "SUM(CASE WHEN NOT completed AND deadline >= :today "
+    "AND deadline <= :cutoff THEN {n} ELSE 0 END) "
+    "FROM {source} GROUP BY priority"
+)
+
+# Triggers that keep task_counts in step with every write to tasks
+_COUNTER_TRIGGERS = {
+    "task_counts_insert": ("AFTER INSERT ON tasks BEGIN {add_new} END"),
+    "task_counts_delete": ("AFTER DELETE ON tasks BEGIN {remove_old} END"),
+    "task_counts_update": (
+        "AFTER UPDATE OF priority, completed, deadline ON tasks "
+        "WHEN old.priority IS NOT new.priority "
+        "OR old.completed IS NOT new.completed "
+        "OR old.deadline IS NOT new.deadline "
+        "BEGIN {remove_old} {add_new} END"
+    ),
+}
+
+_COUNTER_MATCH = (
+    "priority IS {row}.priority AND completed IS {row}.completed "
+    "AND deadline IS {row}.deadline"
+)
+_COUNTER_ADD_NEW = (
+    "UPDATE task_counts SET count = count + 1 WHERE {match}; "
+    "INSERT INTO task_counts (priority, completed, deadline, count) "
+    "SELECT new.priority, new.completed, new.deadline, 1 "
+    "WHERE NOT EXISTS (SELECT 1 FROM task_counts WHERE {match});"
+).format(match=_COUNTER_MATCH.format(row="new"))
+_COUNTER_REMOVE_OLD = (
+    "UPDATE task_counts SET count = count - 1 WHERE {match}; "
+    "DELETE FROM task_counts WHERE {match} AND count <= 0;"
+).format(match=_COUNTER_MATCH.format(row="old"))
+
+
+_HAS_COUNTERS = text(
+    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'task_counts'"
+)
+
+
+def _has_stats_counters(conn) -> bool:
+    return conn.execute(_HAS_COUNTERS).first() is not None
+
+
+def _stats_statement(counters: bool):
+    """The stats query over task_counts when it exists, or over tasks."""
+    if counters:
+        return text(_STATS_SQL.format(n="count", source="task_counts"))
+    return text(_STATS_SQL.format(n="1", source="tasks"))
 
-def search_tasks(query: str) -> list:
-    """Search tasks by title."""
+
+def _stats_from_rows(rows) -> dict:
+    """Build the stats dict from the per-priority rows of the stats query."""
+    return make_task_stats(
+        total=sum(row[1] for row in rows),
+        completed=sum(row[2] for row in rows),
+        overdue=sum(row[3] for row in rows),
+        due_soon=sum(row[4] for row in rows),
+        by_priority={row[0]: row[1] for row in rows},
+    )
+
+
+def enable_stats_counters():
+    """
+    Maintain a task_counts table so query_task_stats() does not scan tasks.
+
+    task_counts holds one row per (priority, completed, deadline) group and
+    is updated by triggers on every insert, update and delete, so reading
+    stats scans the distinct groups rather than the tasks. That is not
+    constant: it grows with the number of distinct deadlines, since the
+    overdue and due-soon counts depend on today's date and are summed at
+    read time. The table persists in the database file; writes pay for a
+    small extra update until disable_stats_counters() is called.
+    """
+    init_db()
+    with engine.begin() as conn:
+        if _has_stats_counters(conn):
+            return
+        _create_stats_counters(conn)
+    logger.info("Enabled materialized task counters")
+
+
+def _create_stats_counters(conn):
+    """Create task_counts and its triggers, seeded from the current tasks."""
+    conn.execute(
+        text(
+            "CREATE TABLE task_counts ("
+            "priority INTEGER, completed BOOLEAN, deadline INTEGER, "
+            "count INTEGER NOT NULL)"
+        )
+    )
+    conn.execute(
+        text(
+            "CREATE INDEX ix_task_counts_group "
+            "ON task_counts (priority, completed, deadline)"
+        )
+    )
+    for name, body in _COUNTER_TRIGGERS.items():
+        conn.execute(
+            text(
+                f"CREATE TRIGGER {name} "
+                + body.format(add_new=_COUNTER_ADD_NEW, remove_old=_COUNTER_REMOVE_OLD)
+            )
+        )
+    # Seed from the tasks written before the counters existed
+    conn.execute(
+        text(
+            "INSERT INTO task_counts (priority, completed, deadline, count) "
+            "SELECT priority, completed, deadline, COUNT(*) FROM tasks "
+            "GROUP BY priority, completed, deadline"
+        )
+    )
+
+
+def disable_stats_counters():
+    """Drop the task_counts table and its triggers."""
+    init_db()
+    with engine.begin() as conn:
+        for name in _COUNTER_TRIGGERS:
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+        conn.execute(text("DROP TABLE IF EXISTS task_counts"))
+    logger.info("Disabled materialized task counters")
+
+
+@_cached("query")
+def _query_task_stats(today: int, cutoff: int) -> dict:
     with get_db() as db:
-        tasks = db.query(Task).filter(Task.title.ilike(f"%{query}%")).all()
-        db.expunge_all()
-        return tasks
\ No newline at end of file
+        conn = db.connection()
+        stmt = _stats_statement(_has_stats_counters(conn))
+        rows = conn.execute(stmt, {"today": today, "cutoff": cutoff}).all()
+    return _stats_from_rows(rows)
+
+
+@metrics.timed
+def query_task_stats(days: int = 7) -> dict:
+    """
+    Get the same statistics as ``utils.get_task_stats`` with one SQL query.
+
+    Reads the task_counts table when enable_stats_counters() has been
+    called (one row per distinct priority, status and deadline), and
+    aggregates the tasks table (one row per task) otherwise.
+
+    Args:
+        days: Window for the "due_soon" count (default: 7)
+
+    Returns:
+        dict: Stats including total, completed, pending, overdue counts
+    """
+    today = day_number(date.today())
+    stats = dict(_query_task_stats(today, today + days))
+    # Cached results are shared, so hand out a copy
+    stats["by_priority"] = dict(stats["by_priority"])
+    return stats
+
+
+# TODO_SLOW_QUERY_MS turns on metrics and the slow-query log at startup
+if metrics.SLOW_QUERY_MS:
+    metrics.enable(slow_query_ms=float(metrics.SLOW_QUERY_MS))
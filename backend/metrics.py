@@ -0,0 +1,291 @@
+"""
+Instrumentation module for ToDoListApp.
+Records statement and backend function latencies, and logs slow queries.
+
+Nothing is recorded until enable() is called: the engine hooks are only
+installed while metrics are on, and timed functions check a single flag.
+Statement latencies cover executing a statement up to its first row;
+fetching the rows is part of the calling function's latency.
+
+Usage:
+    from backend import metrics
+    metrics.enable(slow_query_ms=50)
+    ...
+    print(metrics.snapshot())
+"""
+
+from collections import deque
+from functools import wraps
+import bisect
+import inspect
+import logging
+import os
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the histogram buckets, in milliseconds (plus an overflow)
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+# Log statements slower than this many milliseconds when set in the environment
+SLOW_QUERY_MS = os.getenv("TODO_SLOW_QUERY_MS")
+
+# Number of slow queries kept for snapshot()
+SLOW_QUERY_HISTORY = 50
+
+# Expanded IN (?, ?, ...) lists, collapsed so they share one histogram
+_PARAM_LIST = re.compile(r"\?(?:, \?)+")
+
+
+class Histogram:
+    """Latency histogram with fixed millisecond buckets."""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        """Record one duration."""
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of samples."""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS_MS, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self) -> dict:
+        """Summarize the histogram as plain data."""
+        labels = [f"<={bound}" for bound in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}"]
+        return {
+            "count": self.count,
+            "total_ms": round(self.total, 3),
+            "mean_ms": round(self.total / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max, 3),
+            "p50_ms": round(self.percentile(0.5), 3),
+            "p95_ms": round(self.percentile(0.95), 3),
+            "p99_ms": round(self.percentile(0.99), 3),
+            "buckets": {
+                label: count for label, count in zip(labels, self.counts) if count
+            },
+        }
+
+
+_enabled = False
+_slow_query_ms = None
+_explain = True
+_lock = threading.Lock()
+_statements = {}  # SQL -> Histogram
+_functions = {}  # backend function name -> Histogram
+_slow_queries = deque(maxlen=SLOW_QUERY_HISTORY)
+_engines = []  # Engines hooked by enable() besides backend.database.engine
+
+
+def _observe(table: dict, key: str, seconds: float):
+    with _lock:
+        histogram = table.get(key)
+        if histogram is None:
+            histogram = table[key] = Histogram()
+        histogram.observe(seconds)
+
+
+# =============================================================================
+# ENGINE HOOKS
+# =============================================================================
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is None or conn.info.get("explaining"):
+        return  # The plan lookup for a slow query, not a statement to time
+    # Kept on the statement's execution context rather than the connection,
+    # so a statement that raises leaves nothing behind
+    context._metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_metrics_start", None)
+    if start is None:
+        return  # Metrics were enabled while the statement was running
+    elapsed = time.perf_counter() - start
+    _observe(_statements, _PARAM_LIST.sub("?, ...", statement), elapsed)
+
+    if _slow_query_ms is not None and elapsed * 1000 >= _slow_query_ms:
+        if executemany and parameters:
+            parameters = parameters[0]
+        plan = _explain_query_plan(conn, statement, parameters) if _explain else None
+        with _lock:
+            _slow_queries.append(
+                {
+                    "statement": statement,
+                    "ms": round(elapsed * 1000, 3),
+                    "plan": plan,
+                }
+            )
+        logger.warning(
+            "Slow query (%.1f ms): %s%s",
+            elapsed * 1000,
+            statement,
+            "".join(f"\n    {line}" for line in plan or ()),
+        )
+
+
+def _explain_query_plan(conn, statement, parameters):
+    """Get EXPLAIN QUERY PLAN output for a statement, or None."""
+    from sqlalchemy.exc import SQLAlchemyError
+
+    if (
+        not statement.lstrip()
+        .upper()
+        .startswith(("SELECT", "WITH", "INSERT", "UPDATE", "DELETE"))
+    ):
+        return None
+    # Runs on the SQLAlchemy connection rather than a DBAPI cursor, which
+    # async drivers (aiosqlite) adapt without a .connection attribute
+    conn.info["explaining"] = True
+    try:
+        result = conn.exec_driver_sql(
+            "EXPLAIN QUERY PLAN " + statement, tuple(parameters or ())
+        )
+        return [row[-1] for row in result.all()]
+    except SQLAlchemyError as e:
+        logger.debug("No query plan for slow query: %s", e)
+        return None
+    finally:
+        conn.info["explaining"] = False
+
+
+# =============================================================================
+# PUBLIC API
+# =============================================================================
+
+
+def enable(slow_query_ms: float = None, explain: bool = True):
+    """
+    Start recording latencies.
+
+    Args:
+        slow_query_ms: Log statements taking at least this many milliseconds
+            at WARNING level (None = no slow-query log)
+        explain: Include the EXPLAIN QUERY PLAN output in slow-query logs
+    """
+    global _enabled, _slow_query_ms, _explain
+    from .database import engine
+
+    _slow_query_ms = slow_query_ms
+    _explain = explain
+    if not _enabled:
+        for hooked in (engine, *_engines):
+            _listen(hooked)
+        _enabled = True
+
+
+def disable():
+    """Stop recording latencies; recorded data is kept until reset()."""
+    global _enabled
+    from sqlalchemy import event
+
+    from .database import engine
+
+    if _enabled:
+        for hooked in (engine, *_engines):
+            event.remove(hooked, "before_cursor_execute", _before_cursor_execute)
+            event.remove(hooked, "after_cursor_execute", _after_cursor_execute)
+        _enabled = False
+
+
+def track(engine):
+    """Record the statements of another engine too (e.g. backend.aio's)."""
+    if engine not in _engines:
+        _engines.append(engine)
+        if _enabled:
+            _listen(engine)
+
+
+def _listen(engine):
+    from sqlalchemy import event
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def is_enabled() -> bool:
+    """True while latencies are being recorded."""
+    return _enabled
+
+
+def reset():
+    """Drop every recorded latency and slow query."""
+    with _lock:
+        _statements.clear()
+        _functions.clear()
+        _slow_queries.clear()
+
+
+def snapshot() -> dict:
+    """
+    Get the recorded latencies.
+
+    Returns:
+        dict: "statements" and "functions" map SQL text and backend function
+            names to histogram summaries (slowest total first), and
+            "slow_queries" lists recent slow statements with their plans
+    """
+    with _lock:
+
+        def summarize(table):
+            ordered = sorted(table.items(), key=lambda item: -item[1].total)
+            return {key: histogram.snapshot() for key, histogram in ordered}
+
+        return {
+            "enabled": _enabled,
+            "slow_query_ms": _slow_query_ms,
+            "statements": summarize(_statements),
+            "functions": summarize(_functions),
+            "slow_queries": list(_slow_queries),
+        }
+
+
+def timed(func):
+    """Record the latency of a backend function while metrics are enabled."""
+    name = func.__name__
+
+    if inspect.iscoroutinefunction(func):
+
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            if not _enabled:
+                return await func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _observe(_functions, f"aio.{name}", time.perf_counter() - start)
+
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _observe(_functions, name, time.perf_counter() - start)
+
+    return wrapper
@@ -0,0 +1,361 @@
+"""
+HTTP task server for ToDoListApp.
+Serves backend.database as a small JSON API, so several app windows and
+scripts can share one task store through a single process.
+
+Start it with ``python main.py serve`` and open the app against it with
+``python main.py --server http://127.0.0.1:8765`` (see backend.client).
+
+Tasks are JSON objects with id, title, priority, completed and deadline
+("YYYY-MM-DD" or null).
+
+    GET    /tasks           One keyset page: completed, priority, key,
+                            reverse, after (JSON sort value), after_id, limit
+    POST   /tasks           Add a task, or a list of tasks (returns IDs)
+    DELETE /tasks           Delete every task
+    GET    /tasks/<id>      One task
+    PATCH  /tasks/<id>      Update fields of one task
+    DELETE /tasks/<id>      Delete one task
+    POST   /tasks/update    {"ids": [...], "fields": {...}} in one statement
+    POST   /tasks/delete    {"ids": [...]} in one statement
+    POST   /tasks/import    Records like export files hold, deduplicated
+    GET    /search          q, mode, limit
+    GET    /stats           days
+    GET    /changes         since: tasks written after that change sequence
+                            number (without it, just the current number;
+                            tasks is null if the log was pruned past it)
+
+GET responses carry an ETag built from the data version (and, for
+/stats, the date). Sending it back in If-None-Match returns 304 Not
+Modified until the data changes. Writes
+by other processes are picked up by a ChangeWatcher within
+CHANGE_POLL_INTERVAL, which also refreshes the read cache. Writes are
+applied one at a time, so the server's own threads never wait on each
+other's SQLite write locks.
+"""
+
+from datetime import date
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import json
+import logging
+import re
+import threading
+import time
+
+from . import database
+from .transfer import import_records
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Largest request body accepted, in bytes
+MAX_BODY = 64 * 1024 * 1024
+
+# Seconds between checks for writes by other processes
+CHANGE_POLL_INTERVAL = 0.5
+
+
+class HTTPError(Exception):
+    """An error response with a status code and message."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def task_json(task) -> dict:
+    """Convert a task to its JSON object."""
+    record = task.to_dict() if not isinstance(task, dict) else dict(task)
+    if isinstance(record["deadline"], date):
+        record["deadline"] = record["deadline"].isoformat()
+    return record
+
+
+def _bool(value: str) -> bool:
+    if value.lower() in ("1", "true", "yes"):
+        return True
+    if value.lower() in ("0", "false", "no"):
+        return False
+    raise ValueError(f"Expected true or false, got {value!r}")
+
+
+def _task_fields(fields: dict) -> dict:
+    """Check a task object from a request, parsing its "YYYY-MM-DD" deadline."""
+    if not isinstance(fields, dict):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Expected a task object")
+    deadline = fields.get("deadline")
+    if deadline not in (None, ""):
+        try:
+            deadline = date.fromisoformat(deadline)
+        except (TypeError, ValueError):
+            raise HTTPError(
+                HTTPStatus.BAD_REQUEST,
+                f"Invalid deadline {deadline!r}: expected YYYY-MM-DD",
+            )
+        fields = {**fields, "deadline": deadline}
+    return fields
+
+
+class TaskRequestHandler(BaseHTTPRequestHandler):
+    """Routes requests to backend.database and writes JSON responses."""
+
+    protocol_version = "HTTP/1.1"  # Keep connections open between requests
+    # Headers and body are separate writes; without TCP_NODELAY the body
+    # waits on the client's delayed ACK (~40 ms per small response)
+    disable_nagle_algorithm = True
+    server_version = "ToDoListApp"
+
+    # (method, path pattern, handler name)
+    ROUTES = [
+        ("GET", r"/tasks", "list_tasks"),
+        ("POST", r"/tasks", "add_tasks"),
+        ("DELETE", r"/tasks", "clear_tasks"),
+        ("POST", r"/tasks/update", "update_tasks"),
+        ("POST", r"/tasks/delete", "delete_tasks"),
+        ("POST", r"/tasks/import", "import_tasks"),
+        ("GET", r"/tasks/(\d+)", "get_task"),
+        ("PATCH", r"/tasks/(\d+)", "update_task"),
+        ("DELETE", r"/tasks/(\d+)", "delete_task"),
+        ("GET", r"/search", "search"),
+        ("GET", r"/stats", "stats"),
+        ("GET", r"/changes", "changes"),
+    ]
+    _ROUTES = [(method, re.compile(path), name) for method, path, name in ROUTES]
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    # -------------------------------------------------------------------------
+    # Plumbing
+    # -------------------------------------------------------------------------
+
+    def _dispatch(self, method):
+        url = urlsplit(self.path)
+        self.query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            # Read the body even if the request then fails, so the next
+            # request on this connection starts at the right byte
+            self.body = self._read_body()
+            handler, args = self._route(method, url.path)
+            if method == "GET":
+                # Taken before reading, so a write that lands mid-read
+                # leaves the response with an outdated tag
+                etag = self._etag(handler)
+                if etag in self.headers.get("If-None-Match", ""):
+                    self._send(HTTPStatus.NOT_MODIFIED, etag=etag)
+                    return
+                self._send(HTTPStatus.OK, handler(*args), etag=etag)
+            else:
+                with self.server.write_lock:
+                    status, body = handler(*args)
+                self._send(status, body)
+        except HTTPError as e:
+            self._send(e.status, {"error": str(e)})
+        except (ValueError, KeyError, TypeError) as e:
+            self._send(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+        except Exception:
+            # The log has the details; database errors quote the SQL, so
+            # they stay out of the response
+            logger.exception("Request failed: %s %s", method, self.path)
+            self._send(
+                HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal server error"}
+            )
+
+    def _route(self, method, path):
+        allowed = False
+        for route_method, pattern, name in self._ROUTES:
+            match = pattern.fullmatch(path)
+            if match:
+                if route_method == method:
+                    args = [int(arg) for arg in match.groups()]
+                    return getattr(self, name), args
+                allowed = True
+        if allowed:
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed")
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"No such resource: {path}")
+
+    def _etag(self, handler) -> str:
+        tag = f"{self.server.instance}-{database.data_version()}"
+        if handler.__name__ == "stats":
+            # Overdue and due-soon counts also change at midnight
+            tag += f"-{date.today().isoformat()}-{self._int('days', 7)}"
+        return f'"{tag}"'
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY:
+            self.close_connection = True
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request too large")
+        return self.rfile.read(length)
+
+    def _body(self):
+        return json.loads(self.body or b"null")
+
+    def _send(self, status, body=None, etag=None):
+        data = b"" if body is None else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        if etag is not None:
+            self.send_header("ETag", etag)
+        if body is not None:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _int(self, name, default=None):
+        value = self.query.get(name)
+        return int(value) if value not in (None, "") else default
+
+    def _flag(self, name, default=None):
+        value = self.query.get(name)
+        return _bool(value) if value not in (None, "") else default
+
+    # -------------------------------------------------------------------------
+    # Reads (return the response body)
+    # -------------------------------------------------------------------------
+
+    def list_tasks(self):
+        after = None
+        if "after_id" in self.query:
+            value = json.loads(self.query.get("after", "null"))
+            after = (value, self._int("after_id"))
+        page = database.get_tasks_page(
+            completed=self._flag("completed"),
+            priority=self._int("priority"),
+            key=self.query.get("key", "id"),
+            reverse=self._flag("reverse", False),
+            after=after,
+            limit=self._int("limit", 200),
+        )
+        return [task_json(task) for task in page]
+
+    def get_task(self, task_id):
+        task = database.get_task_by_id(task_id)
+        if task is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No task with ID {task_id}")
+        return task_json(task)
+
+    def search(self):
+        tasks = database.search_tasks(
+            self.query.get("q", ""),
+            mode=self.query.get("mode", "substring"),
+            limit=self._int("limit"),
+        )
+        return [task_json(task) for task in tasks]
+
+    def stats(self):
+        return database.query_task_stats(self._int("days", 7))
+
+    def changes(self):
+        since = self._int("since")
+        if since is None:
+            return {"seq": database.change_seq(), "tasks": [], "deleted": []}
+        seq, tasks, deleted = database.get_changes(since)
+        if tasks is not None:
+            tasks = [task_json(task) for task in tasks]
+        return {"seq": seq, "tasks": tasks, "deleted": deleted}
+
+    # -------------------------------------------------------------------------
+    # Writes (return status and body)
+    # -------------------------------------------------------------------------
+
+    def add_tasks(self):
+        body = self._body()
+        if isinstance(body, list):
+            tasks = [_task_fields(task) for task in body]
+            return HTTPStatus.CREATED, {"ids": database.add_tasks(tasks)}
+        body = _task_fields(body)
+        task = database.add_task(
+            body["title"], body.get("priority", 1), body.get("deadline")
+        )
+        return HTTPStatus.CREATED, task_json(task)
+
+    def clear_tasks(self):
+        return HTTPStatus.OK, {"deleted": database.clear_all_tasks()}
+
+    def update_task(self, task_id):
+        if not database.update_task(task_id, **_task_fields(self._body())):
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No task with ID {task_id}")
+        return HTTPStatus.OK, task_json(database.get_task_by_id(task_id))
+
+    def delete_task(self, task_id):
+        if not database.delete_task(task_id):
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No task with ID {task_id}")
+        return HTTPStatus.NO_CONTENT, None
+
+    def update_tasks(self):
+        body = self._body()
+        updated = database.update_tasks(body["ids"], **_task_fields(body["fields"]))
+        return HTTPStatus.OK, {"ids": updated}
+
+    def delete_tasks(self):
+        return HTTPStatus.OK, {"ids": database.delete_tasks(self._body()["ids"])}
+
+    def import_tasks(self):
+        return HTTPStatus.OK, {"added": import_records(self._body())}
+
+
+class TaskServer(ThreadingHTTPServer):
+    """Threaded HTTP server with one write lock shared by its handlers."""
+
+    daemon_threads = True
+
+    def __init__(self, address, handler=TaskRequestHandler):
+        super().__init__(address, handler)
+        self.write_lock = threading.Lock()
+        # Part of every ETag: the data version starts over with each run
+        self.instance = f"{time.time_ns():x}"
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, cache: bool = True):
+    """
+    Run the task server until interrupted.
+
+    Args:
+        host: Interface to listen on (default: localhost only)
+        port: TCP port (0 = any free port)
+        cache: Serve repeated reads from the read cache
+    """
+    if cache:
+        database.enable_cache()
+    database.init_db()
+    watcher = database.ChangeWatcher()
+    watcher.poll()  # Start from the current sequence number
+    threading.Thread(
+        target=_watch, args=(watcher,), name="change-watcher", daemon=True
+    ).start()
+    server = TaskServer((host, port))
+    host, port = server.server_address[:2]
+    logger.info("Serving %s on http://%s:%d", database.DATABASE_PATH, host, port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def _watch(watcher):
+    """Poll for other processes' writes until the process exits."""
+    while True:
+        time.sleep(CHANGE_POLL_INTERVAL)
+        try:
+            watcher.poll()
+        except Exception as e:
+            logger.warning("Could not check for changes: %s", e)
@@ -0,0 +1,316 @@
+"""
+Import/export module for ToDoListApp.
+Streams tasks between the database and JSON files in constant memory.
+"""
+
+from datetime import date
+from itertools import islice
+import json
+import logging
+import re
+
+from sqlalchemy import select
+
+from . import metrics
+from .database import (
+    Task,
+    get_db,
+    add_tasks,
+    content_hash,
+    fill_content_hashes,
+    iter_tasks,
+)
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("json", "ndjson")
+
+_ISO_DATE = re.compile(r"(\d{4})-(\d{2})-(\d{2})")
+_EXPORT_DATE = re.compile(r"(\d{2})-(\d{2})-(\d{4})")
+
+
+def _export_deadline(deadline):
+    """Convert a deadline date to the file format "DD-MM-YYYY"."""
+    if deadline is None:
+        return "N/A"
+    return f"{deadline.day:02d}-{deadline.month:02d}-{deadline.year:04d}"
+
+
+def _import_deadline(deadline):
+    """Convert a "DD-MM-YYYY" (or "YYYY-MM-DD") deadline to a date, or None."""
+    if not deadline:
+        return None
+    match = _EXPORT_DATE.fullmatch(deadline)
+    if match:
+        day, month, year = map(int, match.groups())
+    else:
+        match = _ISO_DATE.fullmatch(deadline)
+        if not match:
+            return None
+        year, month, day = map(int, match.groups())
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def _guess_format(path):
+    return "ndjson" if str(path).endswith((".ndjson", ".jsonl")) else "json"
+
+
+# =============================================================================
+# EXPORT
+# =============================================================================
+
+
+def iter_export_records(chunk_size: int = 1000):
+    """
+    Yield every task as an export record, one keyset page at a time.
+
+    Each page is read in its own short transaction, so the app can keep
+    writing while a large export runs.
+
+    Args:
+        chunk_size: Number of rows fetched from SQLite at a time
+
+    Yields:
+        dict: Records with id, title, priority, completed and deadline
+    """
+    return map(export_record, iter_tasks(key="id", page_size=chunk_size))
+
+
+def export_record(task) -> dict:
+    """Convert a task to the record written to export files."""
+    return {
+        "id": task.id,
+        "title": task.title,
+        "priority": task.priority,
+        "completed": task.completed,
+        "deadline": _export_deadline(task.deadline),
+    }
+
+
+def write_tasks(
+    file, fmt: str = "json", chunk_size: int = 1000, progress=None, tasks=None
+) -> int:
+    """
+    Write every task to an open text file, one keyset page at a time.
+
+    Args:
+        file: Writable text file
+        fmt: "json" for a JSON array or "ndjson" for one task per line
+        chunk_size: Number of rows fetched from SQLite at a time
+        progress: Optional callback, called with the running count after
+            every ``chunk_size`` tasks
+        tasks: Tasks to write instead of reading the database (optional)
+
+    Returns:
+        int: Number of tasks written
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}")
+
+    if tasks is None:
+        records = iter_export_records(chunk_size)
+    else:
+        records = map(export_record, tasks)
+
+    count = 0
+    if fmt == "json":
+        file.write("[")
+    for record in records:
+        line = json.dumps(record, ensure_ascii=False)
+        if fmt == "json":
+            file.write(",\n    " if count else "\n    ")
+        file.write(line)
+        if fmt == "ndjson":
+            file.write("\n")
+        count += 1
+        if progress is not None and count % chunk_size == 0:
+            progress(count)
+    if fmt == "json":
+        file.write("\n]\n" if count else "]\n")
+    return count
+
+
+@metrics.timed
+def export_tasks(
+    path, fmt: str = None, chunk_size: int = 1000, progress=None, tasks=None
+) -> int:
+    """
+    Write every task to a file without loading them all into memory.
+
+    Args:
+        path: Destination file
+        fmt: "json" for a JSON array or "ndjson" for one task per line
+            (default: guessed from the file extension)
+        chunk_size: Number of rows fetched from SQLite at a time
+        progress: Optional callback, called with the running count after
+            every ``chunk_size`` tasks
+        tasks: Tasks to write instead of reading the database (optional)
+
+    Returns:
+        int: Number of tasks written
+    """
+    fmt = fmt or _guess_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}")
+
+    with open(path, "w", encoding="utf-8") as file:
+        count = write_tasks(file, fmt, chunk_size, progress, tasks)
+
+    logger.info("Exported %d tasks to %s", count, path)
+    return count
+
+
+# =============================================================================
+# IMPORT
+# =============================================================================
+
+
+def _iter_json_array(file, buffer: str = "", read_size: int = 1 << 16):
+    """Yield the elements of a JSON array one at a time."""
+    decoder = json.JSONDecoder()
+    pos = 0
+    started = False
+    eof = False
+
+    while True:
+        # Skip whitespace, the opening bracket and separators
+        while pos < len(buffer) and (buffer[pos].isspace() or buffer[pos] in ",["):
+            if buffer[pos] == "[":
+                if started:
+                    break
+                started = True
+            pos += 1
+
+        if pos < len(buffer):
+            if not started:
+                raise json.JSONDecodeError("Expected a JSON array", buffer, pos)
+            if buffer[pos] == "]":
+                return
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                yield value
+                pos = end
+                continue
+
+        if eof:
+            raise json.JSONDecodeError("Unterminated JSON array", buffer, pos)
+        chunk = file.read(read_size)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+
+def _iter_ndjson(file):
+    """Yield one JSON value per non-empty line."""
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+
+def iter_import_records(file):
+    """
+    Yield task records from an open JSON array or NDJSON file.
+
+    The format is detected from the first non-blank character.
+    """
+    first = ""
+    while True:
+        char = file.read(1)
+        if not char or not char.isspace():
+            first = char
+            break
+
+    if first == "[":
+        yield from _iter_json_array(file, buffer=first)
+    elif first:
+        first_line = first + file.readline()
+        if first_line.strip():
+            yield json.loads(first_line)
+        yield from _iter_ndjson(file)
+
+
+@metrics.timed
+def import_tasks(path, batch_size: int = 1000, progress=None) -> int:
+    """
+    Add tasks from a JSON array or NDJSON file, skipping duplicate titles.
+
+    Records are read, deduplicated and inserted one batch at a time. Titles
+    are matched against the database through the indexed content_hash
+    column, and against earlier records of the same file.
+
+    Args:
+        path: Source file
+        batch_size: Number of records per lookup and insert transaction
+        progress: Optional callback, called with the running count of added
+            tasks after every batch
+
+    Returns:
+        int: Number of tasks added
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        added = import_records(iter_import_records(file), batch_size, progress)
+
+    logger.info("Imported %d tasks from %s", added, path)
+    return added
+
+
+def import_records(records, batch_size: int = 1000, progress=None) -> int:
+    """
+    Add task records like import_tasks() does, from any iterable.
+
+    Args:
+        records: Dicts with "title" and optional "priority" and "deadline"
+            ("DD-MM-YYYY" or "YYYY-MM-DD")
+        batch_size: Number of records per lookup and insert transaction
+        progress: Optional callback, called with the running count of added
+            tasks after every batch
+
+    Returns:
+        int: Number of tasks added
+    """
+    # Rows written without a hash would never match below
+    filled = fill_content_hashes()
+    if filled:
+        logger.info("Hashed %d task titles written without content_hash", filled)
+
+    records = iter(records)
+    added = 0
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            break
+
+        hashes = {content_hash(record["title"]) for record in batch}
+        with get_db() as db:
+            existing = set(
+                db.execute(
+                    select(Task.title).where(Task.content_hash.in_(hashes))
+                ).scalars()
+            )
+
+        new_tasks = []
+        for record in batch:
+            title = record["title"]
+            if title in existing:
+                continue
+            existing.add(title)
+            new_tasks.append(
+                {
+                    "title": title,
+                    "priority": record.get("priority", 1),
+                    "deadline": _import_deadline(record.get("deadline")),
+                }
+            )
+
+        if new_tasks:
+            added += len(add_tasks(new_tasks, batch_size=batch_size))
+        if progress is not None:
+            progress(added)
+    return added
@@ -3,18 +3,37 @@ Utility functions for ToDoListApp.
 Helper functions for filtering and sorting tasks.
 """
 
-from datetime import datetime, timedelta
+from bisect import bisect_left, insort
+from collections import defaultdict
+from datetime import date, timedelta
+from operator import attrgetter
+
+_ID = attrgetter("id")
+
+
+# Type ranks in SQLite's order: NULL, numbers (and dates), text, blobs
+_RANKS = {type(None): 0, str: 2, bytes: 3}
+
+
+def sort_rank(value) -> int:
+    """
+    Rank of a value's type in SQLite's order: NULL, numbers, text, blobs.
+
+    Sorting by (rank, value) orders any mix of types without comparing
+    unlike ones, so a None priority or a stray string cannot raise.
+    """
+    return _RANKS.get(type(value), 1)
 
 
 def filter_tasks(tasks, completed=None, priority=None):
     """
     Filter tasks based on completed status and/or priority.
-    
+
     Args:
         tasks: List of Task objects
         completed: True/False/None (None = don't filter)
         priority: 1/2/3/None (None = don't filter)
-    
+
     Returns:
         list: Filtered tasks
     """
@@ -30,16 +49,32 @@ def filter_tasks(tasks, completed=None, priority=None):
 def sort_tasks(tasks, key="priority", reverse=False):
     """
     Sort tasks by a given attribute.
-    
+
+    Orders like ``ORDER BY key, id`` in SQLite: ties are broken by ID,
+    missing values (no deadline) sort first, and mixed types follow
+    sort_rank() instead of raising.
+
     Args:
         tasks: List of Task objects
         key: Attribute to sort by ("priority", "title", "deadline")
-        reverse: True for descending order
-    
+        reverse: True for descending order (ties by descending ID)
+
     Returns:
         list: Sorted tasks
     """
-    return sorted(tasks, key=lambda task: getattr(task, key) or "", reverse=reverse)
+    # Sorting is stable, so ordering by ID first breaks ties by ID; input
+    # read from the database is usually in ID order already, making this
+    # pass linear
+    by_id = sorted(tasks, key=_ID, reverse=reverse)
+    try:
+        return sorted(by_id, key=attrgetter(key), reverse=reverse)
+    except TypeError:
+
+        def sort_key(task):
+            value = getattr(task, key)
+            return (sort_rank(value), value)
+
+        return sorted(by_id, key=sort_key, reverse=reverse)
 
 
 def format_tasks(tasks):
@@ -52,43 +87,319 @@ def format_tasks(tasks):
 
 def get_overdue_tasks(tasks):
     """Get tasks that are past their deadline and not completed."""
-    today = datetime.now().strftime("%Y-%m-%d")
+    today = date.today()
     return [
-        task for task in tasks
+        task
+        for task in tasks
         if task.deadline and task.deadline < today and not task.completed
     ]
 
 
 def get_tasks_due_soon(tasks, days=7):
     """Get incomplete tasks due within the next X days."""
-    today = datetime.now()
-    cutoff = (today + timedelta(days=days)).strftime("%Y-%m-%d")
-    today_str = today.strftime("%Y-%m-%d")
-    
+    today = date.today()
+    cutoff = today + timedelta(days=days)
+
     return [
-        task for task in tasks
-        if task.deadline and today_str <= task.deadline <= cutoff and not task.completed
+        task
+        for task in tasks
+        if task.deadline and today <= task.deadline <= cutoff and not task.completed
     ]
 
 
-def get_task_stats(tasks):
+def make_task_stats(total, completed, overdue, due_soon, by_priority):
     """
-    Get statistics about tasks.
-    
+    Build the stats dict returned by get_task_stats and query_task_stats.
+
+    Args:
+        total: Number of tasks
+        completed: Number of completed tasks
+        overdue: Number of incomplete tasks past their deadline
+        due_soon: Number of incomplete tasks due within the window
+        by_priority: Dict of priority -> number of tasks
+
     Returns:
         dict: Stats including total, completed, pending, overdue counts
     """
-    total = len(tasks)
-    if total == 0:
-        return {"total": 0, "completed": 0, "pending": 0, "overdue": 0, "completion_rate": 0.0}
-    
-    completed = len([t for t in tasks if t.completed])
-    overdue = len(get_overdue_tasks(tasks))
-    
     return {
         "total": total,
         "completed": completed,
         "pending": total - completed,
         "overdue": overdue,
-        "completion_rate": round((completed / total) * 100, 1)
-    }
\ No newline at end of file
+        "due_soon": due_soon,
+        "by_priority": dict(sorted(by_priority.items(), key=lambda item: item[0] or 0)),
+        "completion_rate": round((completed / total) * 100, 1) if total else 0.0,
+    }
+
+
+def get_task_stats(tasks, days=7):
+    """
+    Get statistics about tasks in a single pass over the list.
+
+    Use ``database.query_task_stats`` to get the same numbers without
+    loading the tasks.
+
+    Args:
+        tasks: List of Task objects
+        days: Window for the "due_soon" count (default: 7)
+
+    Returns:
+        dict: Stats including total, completed, pending, overdue counts
+    """
+    today = date.today()
+    cutoff = today + timedelta(days=days)
+
+    total = completed = overdue = due_soon = 0
+    by_priority = defaultdict(int)
+    for task in tasks:
+        total += 1
+        by_priority[task.priority] += 1
+        if task.completed:
+            completed += 1
+        elif task.deadline:
+            if task.deadline < today:
+                overdue += 1
+            elif task.deadline <= cutoff:
+                due_soon += 1
+
+    return make_task_stats(total, completed, overdue, due_soon, by_priority)
+
+
+class TitleIndex:
+    """
+    Trigram index over casefolded task titles for substring search.
+
+    Titles are folded once when added. A search intersects the posting sets
+    of the query's trigrams, smallest first, and only checks the surviving
+    candidates with a real substring test. Queries shorter than three
+    characters fall back to one pass over the folded titles.
+    """
+
+    def __init__(self):
+        self._titles = {}  # task id -> folded title
+        self._grams = defaultdict(set)  # trigram -> task ids
+        # Called with (task_id, folded_title) on add, (task_id, None) on remove
+        self.listeners = []
+
+    def __len__(self):
+        return len(self._titles)
+
+    @staticmethod
+    def fold(text):
+        return text.strip().casefold()
+
+    @staticmethod
+    def _trigrams(folded):
+        return {folded[i : i + 3] for i in range(len(folded) - 2)}
+
+    def add(self, task_id, title):
+        """Index (or re-index) one task title."""
+        self._drop(task_id)
+        folded = self.fold(title)
+        self._titles[task_id] = folded
+        for gram in self._trigrams(folded):
+            self._grams[gram].add(task_id)
+        for listener in self.listeners:
+            listener(task_id, folded)
+
+    def add_tasks(self, tasks):
+        """Index the titles of many tasks."""
+        for task in tasks:
+            self.add(task.id, task.title)
+
+    def remove(self, task_id):
+        """Drop a task from the index."""
+        if self._drop(task_id):
+            for listener in self.listeners:
+                listener(task_id, None)
+
+    def _drop(self, task_id):
+        folded = self._titles.pop(task_id, None)
+        if folded is None:
+            return False
+        for gram in self._trigrams(folded):
+            ids = self._grams[gram]
+            ids.discard(task_id)
+            if not ids:
+                del self._grams[gram]
+        return True
+
+    def clear(self):
+        self._titles.clear()
+        self._grams.clear()
+
+    def search(self, text):
+        """
+        Find tasks whose title contains text, ignoring case.
+
+        Returns:
+            set: IDs of the matching tasks
+        """
+        needle = self.fold(text)
+        if not needle:
+            return set(self._titles)
+        if len(needle) < 3:
+            return {
+                task_id for task_id, title in self._titles.items() if needle in title
+            }
+
+        postings = []
+        for gram in self._trigrams(needle):
+            ids = self._grams.get(gram)
+            if not ids:
+                return set()
+            postings.append(ids)
+        postings.sort(key=len)
+
+        candidates = set(postings[0])
+        for ids in postings[1:]:
+            candidates &= ids
+            if not candidates:
+                return candidates
+        titles = self._titles
+        return {task_id for task_id in candidates if needle in titles[task_id]}
+
+
+class SortedViews:
+    """
+    Tasks kept in (sort key, id) order for several sort keys at once.
+
+    Each sort key has one ascending array of (rank, value, id, task)
+    entries, built the first time the key is viewed and then maintained as
+    tasks are added, removed and changed: a binary search and one list
+    insert or delete per key. Descending order is the same array read
+    backwards, because (key, id) descending is its exact reverse. Switching
+    between views therefore costs nothing, and no sort ever runs again.
+    """
+
+    # Batches over this fraction of the tasks are merged with one sort (a
+    # linear pass) instead of inserted one at a time (a binary search and a
+    # move of the entries after each)
+    MERGE_FRACTION = 1 / 8
+
+    def __init__(self):
+        self._tasks = {}  # task id -> task
+        self._orders = {}  # sort key -> sorted entries
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def __contains__(self, task_id):
+        return task_id in self._tasks
+
+    def get(self, task_id):
+        """Return the task with an ID, or None."""
+        return self._tasks.get(task_id)
+
+    @staticmethod
+    def _entry(task, key):
+        value = getattr(task, key)
+        return (sort_rank(value), value, task.id, task)
+
+    @staticmethod
+    def _probe(task, key):
+        # Sorts right before the task's entry: the IDs are unique, so the
+        # task itself is never compared
+        value = getattr(task, key)
+        return (sort_rank(value), value, task.id)
+
+    def add(self, task):
+        """Add a task, or re-place it if its ID is already present."""
+        if task.id in self._tasks:
+            self.remove(task.id)
+        self._tasks[task.id] = task
+        for key, order in self._orders.items():
+            insort(order, self._entry(task, key))
+
+    def add_tasks(self, tasks):
+        """Add many tasks (new IDs only), merging large batches in one sort."""
+        tasks = list(tasks)
+        if len(tasks) <= len(self._tasks) * self.MERGE_FRACTION:
+            for task in tasks:
+                self.add(task)
+            return
+        for task in tasks:
+            self._tasks[task.id] = task
+        for key, order in self._orders.items():
+            # Timsort merges the two sorted runs in linear time
+            order.extend(sorted(self._entry(task, key) for task in tasks))
+            order.sort()
+
+    def remove(self, task_id):
+        """Remove a task by ID; returns it, or None if it was not present."""
+        task = self._tasks.pop(task_id, None)
+        if task is not None:
+            for key, order in self._orders.items():
+                del order[bisect_left(order, self._probe(task, key))]
+        return task
+
+    def update(self, task_id, **fields):
+        """Change fields of a task and move it in every view it moved in."""
+        task = self._tasks[task_id]
+        for key, order in self._orders.items():
+            if key in fields:
+                del order[bisect_left(order, self._probe(task, key))]
+        for field, value in fields.items():
+            setattr(task, field, value)
+        for key, order in self._orders.items():
+            if key in fields:
+                insort(order, self._entry(task, key))
+
+    def clear(self):
+        """Drop every task (views stay bound, now empty)."""
+        self._tasks.clear()
+        for order in self._orders.values():
+            order.clear()
+
+    def view(self, key, reverse=False):
+        """
+        Get the tasks in order of an attribute, ties by ID.
+
+        Returns:
+            SortedView: Live view that follows later changes
+        """
+        order = self._orders.get(key)
+        if order is None:
+            order = sorted(self._entry(task, key) for task in self._tasks.values())
+            self._orders[key] = order
+        return SortedView(self, key, reverse, order)
+
+
+class SortedView:
+    """A sequence of tasks in one SortedViews order, ascending or descending."""
+
+    def __init__(self, views, key, reverse, order):
+        self.views = views
+        self.key = key
+        self.reverse = reverse
+        self._order = order
+
+    def __len__(self):
+        return len(self._order)
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += len(self._order)
+        if self.reverse:
+            row = len(self._order) - 1 - row
+        return self._order[row][3]
+
+    def __iter__(self):
+        order = reversed(self._order) if self.reverse else self._order
+        return (entry[3] for entry in order)
+
+    def row_of(self, task):
+        """Row a task is on, or -1 if it is not in the view."""
+        index = bisect_left(self._order, SortedViews._probe(task, self.key))
+        if index < len(self._order) and self._order[index][2] == task.id:
+            return len(self._order) - 1 - index if self.reverse else index
+        return -1
+
+    def position(self, task):
+        """Row a task is on, or would be inserted at, in this view."""
+        row = self.row_of(task)
+        if row >= 0:
+            return row
+        # Count the entries that come before it in this direction
+        index = bisect_left(self._order, SortedViews._probe(task, self.key))
+        return len(self._order) - index if self.reverse else index
@@ -0,0 +1,6 @@
+"""
+Benchmark suite for ToDoListApp.
+
+Run ``python -m benchmarks.run`` to time the backend and GUI hot paths on
+synthetic data, and ``python -m benchmarks.compare`` to diff two results.
+"""
@@ -0,0 +1,97 @@
+"""
+Compare two benchmark result files.
+
+Usage:
+    python -m benchmarks.compare baseline.json results.json [--threshold 0.2]
+
+Prints the change in median time for every benchmark both files share and
+exits with status 1 if any of them got slower by more than the threshold
+(and by more than --min-delta seconds, so sub-millisecond noise is ignored).
+"""
+
+import argparse
+import json
+import sys
+
+
+def compare(
+    baseline: dict, current: dict, threshold: float = 0.2, min_delta: float = 0.001
+) -> list:
+    """
+    Match up the benchmarks of two reports.
+
+    Args:
+        baseline: Report written by benchmarks.run
+        current: Report to check against the baseline
+        threshold: Relative slowdown that counts as a regression
+        min_delta: Absolute slowdown in seconds below which timings are
+            treated as noise
+
+    Returns:
+        list: (rows, name, baseline median, current median, ratio, regressed)
+    """
+    rows = []
+    for size, old_results in baseline["results"].items():
+        new_results = current["results"].get(size, {})
+        for name, old in old_results.items():
+            new = new_results.get(name)
+            if new is None:
+                continue
+            ratio = new["median"] / old["median"] if old["median"] else 1.0
+            regressed = (
+                ratio > 1 + threshold and new["median"] - old["median"] > min_delta
+            )
+            rows.append(
+                (int(size), name, old["median"], new["median"], ratio, regressed)
+            )
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.compare",
+        description="Compare two benchmark result files.",
+    )
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="relative slowdown reported as a regression (default: 0.2)",
+    )
+    parser.add_argument(
+        "--min-delta",
+        type=float,
+        default=0.001,
+        help="ignore slowdowns under this many seconds (default: 0.001)",
+    )
+    args = parser.parse_args(argv)
+
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+    with open(args.current, encoding="utf-8") as file:
+        current = json.load(file)
+
+    for key in ("python", "sqlite", "db_profile", "platform"):
+        old, new = baseline["meta"].get(key), current["meta"].get(key)
+        if old != new:
+            print(f"warning: {key} differs ({old} vs {new})", file=sys.stderr)
+
+    rows = compare(baseline, current, args.threshold, args.min_delta)
+    print(
+        f"{'rows':>8}  {'benchmark':<28} {'baseline':>11} {'current':>11} {'change':>8}"
+    )
+    for size, name, old, new, ratio, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(
+            f"{size:>8}  {name:<28} {old * 1000:8.2f} ms {new * 1000:8.2f} ms "
+            f"{(ratio - 1) * 100:+7.1f}%{flag}"
+        )
+
+    if any(row[5] for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Synthetic task generator for the benchmarks.
+Produces reproducible task dicts in the format add_tasks() accepts.
+"""
+
+from datetime import date, timedelta
+import random
+
+WORDS = (
+    "buy",
+    "call",
+    "email",
+    "fix",
+    "write",
+    "review",
+    "plan",
+    "clean",
+    "book",
+    "pay",
+    "update",
+    "prepare",
+    "send",
+    "check",
+    "order",
+    "read",
+    "report",
+    "invoice",
+    "meeting",
+    "groceries",
+    "dentist",
+    "car",
+    "taxes",
+    "garden",
+    "release",
+    "backup",
+    "budget",
+    "slides",
+    "flight",
+    "laundry",
+)
+
+
+def generate_tasks(
+    count: int,
+    seed: int = 0,
+    priority_weights=(1, 1, 1),
+    deadline_ratio: float = 0.7,
+    deadline_days=(-30, 90),
+    completed_ratio: float = 0.3,
+    title_words=(2, 5),
+):
+    """
+    Yield synthetic tasks.
+
+    The same arguments always produce the same tasks, so results from
+    different runs are comparable.
+
+    Args:
+        count: Number of tasks
+        seed: Random seed
+        priority_weights: Relative weights of priorities 1, 2 and 3
+        deadline_ratio: Share of tasks that have a deadline
+        deadline_days: (first, last) deadline as days from today
+        completed_ratio: Share of completed tasks
+        title_words: (min, max) number of words per title
+
+    Yields:
+        dict: Tasks with title, priority, completed and deadline
+    """
+    rng = random.Random(seed)
+    today = date.today()
+    for number in range(count):
+        words = rng.choices(WORDS, k=rng.randint(*title_words))
+        deadline = None
+        if rng.random() < deadline_ratio:
+            deadline = (today + timedelta(days=rng.randint(*deadline_days))).isoformat()
+        yield {
+            # The number keeps titles unique, like a real task list
+            "title": f"{' '.join(words)} {number}",
+            "priority": rng.choices((1, 2, 3), weights=priority_weights)[0],
+            "completed": rng.random() < completed_ratio,
+            "deadline": deadline,
+        }
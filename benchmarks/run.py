@@ -0,0 +1,337 @@
+"""
+Benchmark runner for ToDoListApp.
+
+Times the backend and GUI hot paths on synthetic task lists and writes the
+results as JSON. Each dataset size runs in a fresh process against its own
+temporary database, and Qt uses the offscreen platform, so no display is
+needed.
+
+Usage:
+    python -m benchmarks.run --rows 1000 10000 100000 --output results.json
+    python -m benchmarks.compare baseline.json results.json
+"""
+
+import argparse
+from datetime import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.data import generate_tasks
+
+# Words the search benchmarks look for (see benchmarks.data.WORDS)
+SUBSTRING_QUERY = "invoice"
+FULLTEXT_QUERY = "report inv"
+
+# Individual add_task() calls timed per dataset
+SINGLE_ADDS = 100
+
+# Lookups by ID in the read throughput benchmarks, and how many of them
+# the asyncio benchmark keeps in flight at once
+POINT_READS = 1000
+CONCURRENCY = 32
+
+
+def measure(fn, repeat):
+    """
+    Call fn() repeat times and summarize the wall-clock timings.
+
+    Returns:
+        tuple: (summary dict, result of the last call)
+    """
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    summary = {
+        "median": statistics.median(timings),
+        "min": min(timings),
+        "max": max(timings),
+        "runs": repeat,
+    }
+    return summary, result
+
+
+# =============================================================================
+# WORKER (one dataset size, one process)
+# =============================================================================
+
+
+def run_dataset(args) -> dict:
+    """Populate a fresh database with args.worker tasks and time everything."""
+    # The backend reads its configuration when first imported
+    import logging
+
+    from backend import database, transfer, utils
+
+    logging.getLogger().setLevel(logging.WARNING)
+    database.init_db()
+
+    rows = args.worker
+    results = {}
+
+    def bench(name, fn, repeat=args.repeat):
+        summary, result = measure(fn, repeat)
+        results[name] = summary
+        print(
+            f"  {rows:>8} {name:<28} {summary['median'] * 1000:10.2f} ms",
+            file=sys.stderr,
+        )
+        return result
+
+    tasks = list(
+        generate_tasks(
+            rows,
+            seed=args.seed,
+            priority_weights=args.priority_weights,
+            deadline_ratio=args.deadline_ratio,
+            completed_ratio=args.completed_ratio,
+        )
+    )
+
+    # Writes that need an empty table run once
+    ids = bench("add_tasks (bulk import)", lambda: database.add_tasks(tasks), repeat=1)
+
+    loaded = bench("get_all_tasks", database.get_all_tasks)
+    bench("search_tasks substring", lambda: database.search_tasks(SUBSTRING_QUERY))
+    bench(
+        "search_tasks fulltext",
+        lambda: database.search_tasks(FULLTEXT_QUERY, mode="fulltext"),
+    )
+    for key in ("priority", "title", "deadline"):
+        bench(f"sort_tasks {key}", lambda key=key: utils.sort_tasks(loaded, key))
+    bench("get_task_stats", lambda: utils.get_task_stats(loaded))
+    bench("query_task_stats", database.query_task_stats)
+    bench_reads(bench, ids, args.seed)
+
+    export_path = os.path.join(os.path.dirname(args.db), "export.json")
+    bench("save json", lambda: transfer.export_tasks(export_path))
+
+    if not args.no_gui:
+        bench_gui(bench)
+
+    titles = iter(range(SINGLE_ADDS))
+    bench(
+        "add_task",
+        lambda: database.add_task(f"single {next(titles)}", priority=2),
+        repeat=SINGLE_ADDS,
+    )
+
+    bench("clear_all_tasks", database.clear_all_tasks, repeat=1)
+    bench("load json", lambda: transfer.import_tasks(export_path), repeat=1)
+
+    return results
+
+
+def bench_reads(bench, ids, seed):
+    """Time POINT_READS lookups by ID, in sequence and through backend.aio."""
+    import asyncio
+
+    from backend import database
+
+    sample = random.Random(seed).choices(ids, k=POINT_READS)
+    bench(
+        f"get_task_by_id x{POINT_READS}",
+        lambda: [database.get_task_by_id(task_id) for task_id in sample],
+    )
+
+    try:
+        from backend import aio
+    except ImportError as e:
+        print(f"  skipping asyncio benchmark: {e}", file=sys.stderr)
+        return
+
+    async def concurrent_reads():
+        slots = asyncio.Semaphore(CONCURRENCY)
+
+        async def read(task_id):
+            async with slots:
+                return await aio.get_task_by_id(task_id)
+
+        return await asyncio.gather(*map(read, sample))
+
+    loop = asyncio.new_event_loop()
+    try:
+        bench(
+            f"aio get_task_by_id x{POINT_READS}",
+            lambda: loop.run_until_complete(concurrent_reads()),
+        )
+        loop.run_until_complete(aio.dispose())
+    finally:
+        loop.close()
+
+
+def bench_gui(bench):
+    """Time ToDoApp.update_task_list() up to the first painted page."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([])
+    from frontend.gui import ToDoApp
+
+    window = ToDoApp()
+    window.show()
+
+    def settle():
+        while True:
+            window.jobs.wait()
+            app.processEvents()
+            if not window.jobs.is_busy():
+                return
+
+    def update_task_list():
+        window.update_task_list()
+        settle()
+        window.grab()  # Paint the table offscreen
+
+    settle()
+    bench("gui update_task_list", update_task_list)
+    window.close()
+    settle()
+
+
+# =============================================================================
+# DRIVER
+# =============================================================================
+
+
+def metadata(args) -> dict:
+    """Describe the environment so results are only compared like for like."""
+    import sqlite3
+
+    import sqlalchemy
+
+    meta = {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sqlite": sqlite3.sqlite_version,
+        "sqlalchemy": sqlalchemy.__version__,
+        "db_profile": os.getenv("TODO_DB_PROFILE", "safe"),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "priority_weights": args.priority_weights,
+        "deadline_ratio": args.deadline_ratio,
+        "completed_ratio": args.completed_ratio,
+    }
+    try:
+        meta["commit"] = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        meta["commit"] = None
+    return meta
+
+
+def run_all(args) -> dict:
+    """Run every dataset size in its own process and collect the results."""
+    report = {"meta": metadata(args), "results": {}}
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory(prefix="todo-bench-") as tmp:
+            db = os.path.join(tmp, "tasks.db")
+            env = dict(os.environ, TODO_DB_PATH=db, QT_QPA_PLATFORM="offscreen")
+            command = [
+                sys.executable,
+                "-m",
+                "benchmarks.run",
+                "--worker",
+                str(rows),
+                "--db",
+                db,
+                "--repeat",
+                str(args.repeat),
+                "--seed",
+                str(args.seed),
+                "--priority-weights",
+                *map(str, args.priority_weights),
+                "--deadline-ratio",
+                str(args.deadline_ratio),
+                "--completed-ratio",
+                str(args.completed_ratio),
+            ]
+            if args.no_gui:
+                command.append("--no-gui")
+            output = subprocess.run(
+                command, env=env, stdout=subprocess.PIPE, text=True, check=True
+            ).stdout
+        report["results"][str(rows)] = json.loads(output)
+    return report
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run",
+        description="Benchmark ToDoListApp on synthetic task lists.",
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=[1000, 10000, 100000],
+        help="dataset sizes (default: 1000 10000 100000)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="timed runs per read benchmark (default: 5)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--priority-weights",
+        type=float,
+        nargs=3,
+        default=[1, 1, 1],
+        metavar=("LOW", "MEDIUM", "HIGH"),
+    )
+    parser.add_argument(
+        "--deadline-ratio",
+        type=float,
+        default=0.7,
+        help="share of tasks with a deadline (default: 0.7)",
+    )
+    parser.add_argument(
+        "--completed-ratio",
+        type=float,
+        default=0.3,
+        help="share of completed tasks (default: 0.3)",
+    )
+    parser.add_argument(
+        "--no-gui", action="store_true", help="skip the offscreen GUI benchmark"
+    )
+    parser.add_argument("--output", "-o", help="write JSON here instead of stdout")
+    # Internal: run one dataset in this process
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.worker is not None:
+        json.dump(run_dataset(args), sys.stdout)
+        return
+
+    report = run_all(args)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+            file.write("\n")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
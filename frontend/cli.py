@@ -0,0 +1,375 @@
+"""
+Command-line interface for ToDoListApp.
+Runs task operations from the shell without loading Qt.
+
+Usage:
+    python main.py add "Write report" --priority 3 --deadline 2025-01-31
+    python main.py bulk-add < titles.txt
+    python main.py list --pending --sort deadline
+    python main.py list --json | jq .title
+    python main.py complete 4 8 15
+    python main.py list --pending --ids | python main.py delete -
+    python main.py export - --format ndjson
+    python main.py export - | python main.py bulk-add --ndjson
+    python main.py stats
+    python main.py serve --port 8765
+
+Commands that take IDs read them from stdin when given "-" (or none), and
+bulk-add reads one task per line, so a pipeline of thousands of tasks runs
+as a few batched statements in one process. Output is written as rows are
+read, one keyset page at a time.
+
+"serve" runs backend.server, the HTTP task server that app windows opened
+with ``python main.py --server URL`` share.
+"""
+
+import argparse
+from datetime import date
+from itertools import islice
+import json
+import logging
+import os
+import sys
+
+# Importing backend (and SQLAlchemy) is deferred to the command functions,
+# so --help and usage errors return immediately
+COMMANDS = ("add", "bulk-add", "list", "complete", "delete", "export", "stats", "serve")
+
+# Options accepted before the command
+GLOBAL_FLAGS = ("-v", "--verbose")
+
+SORT_KEYS = ("id", "priority", "title", "deadline")
+
+
+def is_cli(argv) -> bool:
+    """True if argv (without the program name) asks for a CLI command."""
+    for arg in argv:
+        if arg not in GLOBAL_FLAGS:
+            return arg in COMMANDS or arg in ("-h", "--help")
+    return False
+
+
+def _deadline(value):
+    """argparse type for "YYYY-MM-DD" dates."""
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM-DD, got {value!r}")
+
+
+def _read_ids(values, stdin):
+    """Yield task IDs from the arguments, or from stdin for "-" or none."""
+    for value in values or ["-"]:
+        if value == "-":
+            for line in stdin:
+                for word in line.split():
+                    yield int(word)
+        else:
+            yield int(value)
+
+
+def _task_record(task) -> dict:
+    record = task.to_dict()
+    if task.deadline is not None:
+        record["deadline"] = task.deadline.isoformat()
+    return record
+
+
+def _task_line(task) -> str:
+    """One tab-separated line: id, status, priority, deadline, title."""
+    status = "done" if task.completed else "todo"
+    deadline = task.deadline.isoformat() if task.deadline is not None else "-"
+    return f"{task.id}\t{status}\t{task.priority}\t{deadline}\t{task.title}\n"
+
+
+# =============================================================================
+# COMMANDS
+# =============================================================================
+
+
+def cmd_add(args, stdin, stdout):
+    from backend.database import add_task
+
+    task = add_task(args.title, args.priority, args.deadline)
+    stdout.write(f"{task['id']}\n")
+    return 0
+
+
+def _ndjson_task(line: str) -> dict:
+    """Parse one bulk-add JSON record, taking deadlines as export writes them."""
+    from backend.transfer import _import_deadline
+
+    record = json.loads(line)
+    deadline = record.get("deadline")
+    if isinstance(deadline, str):
+        record["deadline"] = _import_deadline(deadline)
+        if record["deadline"] is None and deadline not in ("", "N/A"):
+            raise ValueError(f"invalid deadline {deadline!r} for {record['title']!r}")
+    return record
+
+
+def cmd_bulk_add(args, stdin, stdout):
+    from backend.database import add_tasks
+
+    def tasks():
+        for line in stdin:
+            if args.ndjson:
+                if line.strip():
+                    yield _ndjson_task(line)
+            else:
+                title = line.rstrip("\r\n")
+                if title.strip():
+                    yield {
+                        "title": title,
+                        "priority": args.priority,
+                        "deadline": args.deadline,
+                    }
+
+    ids = add_tasks(tasks(), batch_size=args.batch_size)
+    stdout.writelines(f"{task_id}\n" for task_id in ids)
+    return 0
+
+
+def cmd_list(args, stdin, stdout):
+    from backend.database import iter_tasks
+
+    page_size = min(args.limit, 500) if args.limit else 500
+    tasks = iter_tasks(
+        completed=args.completed,
+        priority=args.priority,
+        key=args.sort,
+        reverse=args.reverse,
+        page_size=page_size,
+    )
+    if args.limit:
+        tasks = islice(tasks, args.limit)
+
+    for task in tasks:
+        if args.ids:
+            stdout.write(f"{task.id}\n")
+        elif args.json:
+            stdout.write(json.dumps(_task_record(task), ensure_ascii=False) + "\n")
+        else:
+            stdout.write(_task_line(task))
+    return 0
+
+
+def _batch_ids(args, stdin, stdout, write):
+    """Apply a batch write to the given IDs, reporting IDs that were not found."""
+    ids = list(_read_ids(args.ids, stdin))
+    done = write(ids)
+    stdout.writelines(f"{task_id}\n" for task_id in done)
+
+    missing = sorted(set(ids) - set(done))
+    if missing:
+        print(f"error: no task with ID {', '.join(map(str, missing))}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def cmd_complete(args, stdin, stdout):
+    from backend.database import mark_tasks_complete, mark_tasks_incomplete
+
+    write = mark_tasks_incomplete if args.undo else mark_tasks_complete
+    return _batch_ids(args, stdin, stdout, write)
+
+
+def cmd_delete(args, stdin, stdout):
+    from backend.database import delete_tasks
+
+    return _batch_ids(args, stdin, stdout, delete_tasks)
+
+
+def cmd_export(args, stdin, stdout):
+    from backend.transfer import export_tasks, write_tasks
+
+    if args.path == "-":
+        write_tasks(stdout, args.format or "ndjson")
+    else:
+        count = export_tasks(args.path, args.format)
+        print(f"Exported {count} tasks to {args.path}", file=sys.stderr)
+    return 0
+
+
+def cmd_stats(args, stdin, stdout):
+    from backend.database import query_task_stats
+
+    json.dump(query_task_stats(args.days), stdout, indent=2)
+    stdout.write("\n")
+    return 0
+
+
+def cmd_serve(args, stdin, stdout):
+    # The pool is sized when backend.database is first imported: one
+    # connection per concurrent request, without overflow connections
+    os.environ["TODO_DB_POOL_SIZE"] = str(args.pool_size)
+    os.environ["TODO_DB_POOL_OVERFLOW"] = "0"
+    if args.profile:
+        os.environ["TODO_DB_PROFILE"] = args.profile
+    from backend.server import serve
+
+    print(f"Serving tasks on http://{args.host}:{args.port}", file=sys.stderr)
+    serve(args.host, args.port, cache=not args.no_cache)
+    return 0
+
+
+# =============================================================================
+# ENTRY POINT
+# =============================================================================
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Manage tasks from the command line. "
+        "Run main.py without a command to open the app.",
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="log backend activity to stderr"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="add a task and print its ID")
+    add.add_argument("title")
+    add.add_argument("-p", "--priority", type=int, choices=(1, 2, 3), default=1)
+    add.add_argument("-d", "--deadline", type=_deadline, help="YYYY-MM-DD")
+    add.set_defaults(run=cmd_add)
+
+    bulk = commands.add_parser(
+        "bulk-add", help="add one task per line of stdin and print their IDs"
+    )
+    bulk.add_argument(
+        "--ndjson",
+        action="store_true",
+        help='read JSON objects ({"title": ..., "priority": ..., '
+        '"deadline": ...}) instead of plain titles; accepts "export -" output',
+    )
+    bulk.add_argument(
+        "-p",
+        "--priority",
+        type=int,
+        choices=(1, 2, 3),
+        default=1,
+        help="priority for plain titles",
+    )
+    bulk.add_argument(
+        "-d",
+        "--deadline",
+        type=_deadline,
+        help="deadline for plain titles (YYYY-MM-DD)",
+    )
+    bulk.add_argument("--batch-size", type=int, default=1000)
+    bulk.set_defaults(run=cmd_bulk_add)
+
+    listing = commands.add_parser("list", help="print tasks, one per line")
+    status = listing.add_mutually_exclusive_group()
+    status.add_argument("--completed", action="store_true", default=None)
+    status.add_argument("--pending", dest="completed", action="store_false")
+    listing.add_argument("-p", "--priority", type=int, choices=(1, 2, 3))
+    listing.add_argument("-s", "--sort", choices=SORT_KEYS, default="id")
+    listing.add_argument("-r", "--reverse", action="store_true")
+    listing.add_argument("-n", "--limit", type=int)
+    output = listing.add_mutually_exclusive_group()
+    output.add_argument("--json", action="store_true", help="one JSON object per line")
+    output.add_argument("--ids", action="store_true", help="task IDs only")
+    listing.set_defaults(run=cmd_list)
+
+    complete = commands.add_parser(
+        "complete", help="mark tasks as completed and print the IDs updated"
+    )
+    complete.add_argument("ids", nargs="*", help='task IDs, or "-" to read from stdin')
+    complete.add_argument("--undo", action="store_true", help="mark as pending instead")
+    complete.set_defaults(run=cmd_complete)
+
+    remove = commands.add_parser(
+        "delete", help="delete tasks and print the IDs deleted"
+    )
+    remove.add_argument("ids", nargs="*", help='task IDs, or "-" to read from stdin')
+    remove.set_defaults(run=cmd_delete)
+
+    export = commands.add_parser("export", help="write every task to a file")
+    export.add_argument("path", help='destination file, or "-" for stdout')
+    export.add_argument(
+        "-f",
+        "--format",
+        choices=("json", "ndjson"),
+        help="default: from the file extension (ndjson for stdout)",
+    )
+    export.set_defaults(run=cmd_export)
+
+    stats = commands.add_parser("stats", help="print task statistics as JSON")
+    stats.add_argument(
+        "--days", type=int, default=7, help='window for "due_soon" (default: 7)'
+    )
+    stats.set_defaults(run=cmd_stats)
+
+    server = commands.add_parser(
+        "serve", help="share the task database over HTTP (see backend/server.py)"
+    )
+    server.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="interface to listen on (default: 127.0.0.1)",
+    )
+    server.add_argument("--port", type=int, default=8765)
+    server.add_argument(
+        "--pool-size",
+        type=int,
+        default=8,
+        help="pooled SQLite connections (default: 8)",
+    )
+    server.add_argument(
+        "--profile",
+        choices=("safe", "balanced", "throughput"),
+        help="SQLite PRAGMA profile (default: TODO_DB_PROFILE)",
+    )
+    server.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="always read from SQLite instead of the read cache",
+    )
+    server.set_defaults(run=cmd_serve)
+
+    return parser
+
+
+def main(argv=None, stdin=None, stdout=None) -> int:
+    """
+    Run one command.
+
+    Returns:
+        int: Exit status (0 = success)
+    """
+    args = build_parser().parse_args(argv)
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+
+    # The backend logs every bulk insert at INFO; keep stderr for errors
+    level = logging.INFO if args.verbose else logging.WARNING
+    logging.basicConfig(level=level)
+    logging.getLogger().setLevel(level)
+
+    try:
+        return args.run(args, stdin, stdout)
+    except BrokenPipeError:
+        # The reader (e.g. head) has gone; stop quietly, and keep Python
+        # from failing again when it flushes stdout on exit
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 0
+    except (ValueError, KeyError, OSError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    except Exception as e:
+        # Values the database layer rejects. SQLAlchemy is only imported
+        # once a command has used the backend, so it is checked here.
+        from sqlalchemy.exc import StatementError
+
+        if not isinstance(e, StatementError):
+            raise
+        print(f"error: {e.orig}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
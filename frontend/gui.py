@@ -1,7 +1,6 @@
 import sys
 import os
 import json
-import winreg
 
 # Add the parent directory (ToDoListApp) to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -11,173 +10,149 @@ from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
     QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QLineEdit,
     QComboBox,
     QMessageBox,
     QDateEdit,
     QHeaderView,
+    QLabel,
+    QAbstractItemView,
 )
-from PySide6.QtGui import QColor
-from PySide6.QtCore import QFile, QTimer, QDate
-from backend.database import (
-    add_task,
-    get_all_tasks,
-    mark_task_complete,
-    delete_task,
-    clear_all_tasks,
-)
-from backend.utils import sort_tasks, format_tasks
+from PySide6.QtGui import QGuiApplication
+from PySide6.QtCore import Qt, QEvent, QTimer, QDate
+from backend import database
+from backend.database import TaskRow
+from frontend.task_model import TaskTableModel, TaskFilterModel
+from frontend.theme import STYLESHEETS, is_dark_mode
+from frontend.workers import JobRunner
+
+# How often to check for writes by other processes, in milliseconds
+WATCH_INTERVAL_MS = 500
+
+# (sort key, reverse) for each sort_dropdown entry, in order
+SORT_ORDERS = [
+    ("priority", True),
+    ("priority", False),
+    ("title", False),
+    ("deadline", False),
+    ("deadline", True),
+]
+
+
+class LocalStore:
+    """The task operations the window uses, run on the local database file."""
+
+    add_task = staticmethod(database.add_task)
+    mark_tasks_complete = staticmethod(database.mark_tasks_complete)
+    delete_tasks = staticmethod(database.delete_tasks)
+    clear_all_tasks = staticmethod(database.clear_all_tasks)
+    get_tasks_page = staticmethod(database.get_tasks_page)
+    change_seq = staticmethod(database.change_seq)
+    watch = staticmethod(database.ChangeWatcher)
+
+    # backend.transfer is only imported once a file is saved or loaded
+    @staticmethod
+    def export_tasks(*args, **kwargs):
+        from backend.transfer import export_tasks
+
+        return export_tasks(*args, **kwargs)
+
+    @staticmethod
+    def import_tasks(*args, **kwargs):
+        from backend.transfer import import_tasks
+
+        return import_tasks(*args, **kwargs)
 
 
 class ToDoApp(QWidget):
     """Main GUI Application for the To-Do List Manager"""
 
-    def __init__(self):
+    def __init__(self, store=None):
+        """
+        Args:
+            store: Where tasks are kept: LocalStore() (the default) for the
+                local database, or a backend.client.TaskClient for a server
+        """
         super().__init__()
+        self.store = store or LocalStore()
         self.setWindowTitle("To-Do List Manager")
         self.setGeometry(200, 200, 800, 600)  # Increased size for better layout
         self.setMinimumSize(800, 600)  # Prevents the window from becoming too small
-        self.dark_mode = self.is_windows_dark_mode()
+
+        # Database calls run in the background so the window never blocks
+        self.jobs = JobRunner(self)
+        self.jobs.busy_changed.connect(self.show_busy)
+        self.jobs.error.connect(self.show_error)
+
+        self.dark_mode = is_dark_mode()
         self.apply_theme()
         self.initUI()
 
-        self.theme_timer = QTimer(self)
-        self.theme_timer.timeout.connect(self.check_theme_update)
-        self.theme_timer.start(3000)
+        # Follow system theme changes as Qt reports them, without polling
+        QGuiApplication.styleHints().colorSchemeChanged.connect(self.check_theme_update)
+
+        # Show tasks that other processes (or other windows sharing a task
+        # server) add, change or delete, without reloading the table
+        self.watcher = None
+        self._polling = False
+        self.watch_timer = QTimer(self)
+        self.watch_timer.setInterval(WATCH_INTERVAL_MS)
+        self.watch_timer.timeout.connect(self.poll_changes)
+        self.jobs.submit(
+            self.store.change_seq,
+            on_result=self.start_watching,
+            # Load anyway and let the first poll take the number; a store
+            # that cannot be reached reports it on the first page
+            on_error=lambda error: self.start_watching(None),
+        )
+
+    def start_watching(self, seq):
+        """
+        Watch for changes after a sequence number, then load the table.
+
+        The number is taken before the first page is read, so writes made
+        while the table loads are picked up by the first poll.
+        """
+        self.watcher = self.store.watch(since=seq)
+        self.update_task_list()
+        self.watch_timer.start()
+
+    def poll_changes(self):
+        """Check for outside writes in the background and show them."""
+        if self._polling:
+            return
+        self._polling = True
+
+        def polled(changes):
+            self._polling = False
+            if changes is not None:
+                self.task_model.apply_changes(*changes)
+
+        def failed(error):
+            # Checked again on the next tick; not worth a dialog each time
+            self._polling = False
+
+        self.jobs.submit(
+            self.watcher.poll, quiet=True, on_result=polled, on_error=failed
+        )
 
     def check_theme_update(self):
-        current_mode = self.is_windows_dark_mode()
+        """Re-style the window if the system theme really changed."""
+        current_mode = is_dark_mode()
         if current_mode != self.dark_mode:
             self.dark_mode = current_mode
             self.apply_theme()
 
     def apply_theme(self):
         """Apply consistent dark or light mode styling throughout the application"""
-        if self.is_windows_dark_mode():
-            theme_style = """
-                QWidget { background-color: #2E2E2E; color: white; }
-
-                QPushButton {
-                    background-color: #444; 
-                    color: white;
-                    border-radius: 8px;
-                    padding: 8px;
-                    font-size: 14px;
-                    border: 1px solid #666;
-                }
-                QPushButton:hover { background-color: #555; }
-                QPushButton:pressed { background-color: #666; }
-                QPushButton#delete_task_button { background-color: #D9534F; }
-                QPushButton#delete_task_button:hover { background-color: #C9302C; }
-                QPushButton#complete_task_button { background-color: #5CB85C; }
-                QPushButton#complete_task_button:hover { background-color: #4CAE4C; }
-
-                QTableWidget {
-                    background-color: #3A3A3A;
-                    color: white;
-                    gridline-color: #555;
-                    selection-background-color: #555;
-                }
-                QHeaderView::section {
-                    background-color: #444;
-                    padding: 5px;
-                    font-weight: bold;
-                    border: 1px solid #666;
-                }
-
-                QComboBox, QDateEdit, QLineEdit {
-                    background-color: #3A3A3A;
-                    color: white;
-                    border-radius: 6px;
-                    padding: 6px;
-                    border: 1px solid #666;
-                    font-size: 14px;
-                }
-                QComboBox:hover, QDateEdit:hover, QLineEdit:hover { border: 1px solid #888; }
-                QComboBox QAbstractItemView {
-                    background-color: #3A3A3A;
-                    selection-background-color: #555;
-                    border-radius: 6px;
-                }
-                QLineEdit:focus {
-                    border: 2px solid #1DB954;
-                    background-color: #444;
-                }
-            """
-        else:
-            theme_style = """
-                QWidget { background-color: #F5F5F5; color: black; }
-
-                QPushButton {
-                    background-color: #E0E0E0; 
-                    color: black;
-                    border-radius: 8px;
-                    padding: 8px;
-                    font-size: 14px;
-                    border: 1px solid #BDBDBD;
-                }
-                QPushButton:hover { background-color: #D6D6D6; }
-                QPushButton:pressed { background-color: #BDBDBD; }
-                QPushButton#delete_task_button { background-color: #FF6B6B; }
-                QPushButton#delete_task_button:hover { background-color: #FF3B3B; }
-                QPushButton#complete_task_button { background-color: #4CAF50; }
-                QPushButton#complete_task_button:hover { background-color: #45A049; }
-
-                QTableWidget {
-                    background-color: white;
-                    color: black;
-                    gridline-color: #CCC;
-                    selection-background-color: #D6D6D6;
-                }
-                QHeaderView::section {
-                    background-color: #E0E0E0;
-                    padding: 5px;
-                    font-weight: bold;
-                    border: 1px solid #BDBDBD;
-                }
-
-                QComboBox, QDateEdit, QLineEdit {
-                    background-color: #FFFFFF;
-                    color: black;
-                    border-radius: 6px;
-                    padding: 6px;
-                    border: 1px solid #BDBDBD;
-                    font-size: 14px;
-                }
-                QComboBox:hover, QDateEdit:hover, QLineEdit:hover { border: 1px solid #888; }
-                QComboBox QAbstractItemView {
-                    background-color: #F5F5F5;
-                    selection-background-color: #D6D6D6;
-                    border-radius: 6px;
-                }
-                QLineEdit:focus {
-                    border: 2px solid #1DB954;
-                    background-color: #F0F0F0;
-                }
-            """
-
-        self.setStyleSheet(theme_style)
-
-        # Apply the theme to individual widgets if necessary
-        if hasattr(self, "search_bar"):
-            self.search_bar.setStyleSheet(theme_style)
+        self.setStyleSheet(STYLESHEETS[self.dark_mode])
 
-    @staticmethod
-    def is_windows_dark_mode():
-        """Detect Windows dark mode setting."""
-        try:
-            registry = winreg.ConnectRegistry(None, winreg.HKEY_CURRENT_USER)
-            key = winreg.OpenKey(
-                registry,
-                r"Software\Microsoft\Windows\CurrentVersion\Themes\Personalize",
-            )
-            value, _ = winreg.QueryValueEx(key, "AppsUseLightTheme")
-            winreg.CloseKey(key)
-            return value == 0
-        except (FileNotFoundError, OSError, PermissionError):
-            return False
+    def changeEvent(self, event):
+        # Platforms without color scheme hints still send ThemeChange
+        if event.type() == QEvent.ThemeChange:
+            self.check_theme_update()
+        super().changeEvent(event)
 
     def initUI(self):
         layout = QVBoxLayout()
@@ -201,12 +176,14 @@ class ToDoApp(QWidget):
         self.add_task_button.clicked.connect(self.add_task)
         layout.addWidget(self.add_task_button)
 
-        self.task_table = QTableWidget(self)
-        self.task_table.setColumnCount(5)  # Ensure 5 columns including Deadline
-        self.task_table.setHorizontalHeaderLabels(
-            ["ID", "Title", "Priority", "Status", "Deadline"]
+        self.task_model = TaskTableModel(
+            self, jobs=self.jobs, fetch_page=self.store.get_tasks_page
         )
-        self.task_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.task_filter = TaskFilterModel(self.task_model, self)
+        self.task_table = QTableView(self)
+        self.task_table.setModel(self.task_filter)
+        self.task_table.setSelectionBehavior(QTableView.SelectRows)
+        self.task_table.setSelectionMode(QAbstractItemView.ExtendedSelection)
         layout.addWidget(self.task_table)
 
         self.complete_task_button = QPushButton("Mark as Completed", self)
@@ -219,7 +196,13 @@ class ToDoApp(QWidget):
 
         self.sort_dropdown = QComboBox(self)
         self.sort_dropdown.addItems(
-            ["Priority (High to Low)", "Priority (Low to High)", "Title (A-Z)"]
+            [
+                "Priority (High to Low)",
+                "Priority (Low to High)",
+                "Title (A-Z)",
+                "Deadline (Earliest First)",
+                "Deadline (Latest First)",
+            ]
         )
         self.sort_dropdown.currentIndexChanged.connect(self.update_task_list)
         layout.addWidget(self.sort_dropdown)
@@ -238,34 +221,26 @@ class ToDoApp(QWidget):
 
         self.search_bar = QLineEdit(self)
         self.search_bar.setPlaceholderText("🔍 Search tasks...")
-        self.search_bar.setStyleSheet(
-            """
-            QLineEdit {
-                background-color: #3A3A3A; /* Dark background */
-                color: white;
-                border: 2px solid #555;
-                border-radius: 8px;
-                padding: 6px;
-                font-size: 14px;
-            }
-            QLineEdit:focus {
-                border: 2px solid #1DB954; /* Green border when focused */
-                background-color: #444;
-            }
-        """
-        )
-        self.search_bar.textChanged.connect(self.filter_tasks)
+        self.search_bar.setObjectName("search_bar")
+        # Wait for a pause in typing before searching
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(200)
+        self.search_timer.timeout.connect(self.filter_tasks)
+        self.search_bar.textChanged.connect(self.search_timer.start)
         layout.addWidget(self.search_bar)
 
+        self.status_label = QLabel(self)
+        layout.addWidget(self.status_label)
+
         self.setLayout(layout)
-        self.update_task_list()
 
         self.complete_task_button.setObjectName("complete_task_button")
         self.delete_task_button.setObjectName("delete_task_button")
 
         # Set resize mode for all columns to Stretch
         header = self.task_table.horizontalHeader()
-        for i in range(self.task_table.columnCount()):
+        for i in range(self.task_model.columnCount()):
             header.setSectionResizeMode(i, QHeaderView.Stretch)
 
         # Resize columns to fit the content automatically
@@ -273,113 +248,113 @@ class ToDoApp(QWidget):
 
     def filter_tasks(self):
         """Filter tasks based on user input in the search bar."""
-        search_text = self.search_bar.text().strip().lower()
+        search_text = self.search_bar.text().strip()
+
+        if search_text and self.task_model.canFetchMore():
+            # Rows can only be matched once they are loaded
+            self.task_model.fetch_all(callback=self.filter_tasks)
+            return
+
+        self.task_filter.set_search(search_text)
+
+    def selected_tasks(self):
+        """Return the tasks on the selected rows."""
+        return [
+            self.task_model.task_at(self.task_filter.mapToSource(index).row())
+            for index in self.task_table.selectionModel().selectedRows()
+        ]
+
+    def show_busy(self, busy):
+        """Show that background database work is in progress."""
+        if busy:
+            self.setCursor(Qt.BusyCursor)
+            self.status_label.setText("Working...")
+        else:
+            self.unsetCursor()
+            self.status_label.clear()
+
+    def show_error(self, error):
+        QMessageBox.warning(self, "Database Error", str(error))
 
-        for row in range(self.task_table.rowCount()):
-            title_item = self.task_table.item(row, 1)  # Title column
-            if title_item:
-                title = title_item.text().strip().lower()
-                self.task_table.setRowHidden(row, search_text not in title)
+    def closeEvent(self, event):
+        # Let queued writes reach the database before the app exits
+        self.watch_timer.stop()
+        self.jobs.wait()
+        if self.watcher is not None:
+            self.watcher.close()
+        super().closeEvent(event)
 
     def add_task(self):
         title = self.task_input.text().strip()
         priority = self.priority_dropdown.currentIndex() + 1
-        deadline = self.deadline_input.date().toString("yyyy-MM-dd")  # Format deadline
+        deadline = self.deadline_input.date().toPython()  # Deadline as a date
 
         if title:
-            add_task(title, priority, deadline)  # Pass deadline to database
             self.task_input.clear()
-            self.update_task_list()
+            self.jobs.submit(
+                self.store.add_task,
+                title,
+                priority,
+                deadline,  # Pass deadline to database
+                write=True,
+                on_result=lambda new_task: self.task_model.insert_task(
+                    TaskRow(**new_task)
+                ),
+            )
         else:
             QMessageBox.warning(self, "Input Error", "Task title cannot be empty!")
 
     def update_task_list(self):
-        tasks = get_all_tasks()
-        sort_index = self.sort_dropdown.currentIndex()
-        sort_key, reverse = (
-            ("priority", True)
-            if sort_index == 0
-            else ("priority", False) if sort_index == 1 else ("title", False)
-        )
-        sorted_tasks = sort_tasks(tasks, key=sort_key, reverse=reverse)
-
-        self.task_table.setRowCount(len(sorted_tasks))
-        self.task_table.setColumnCount(5)  # Ensure there are 5 columns now
-        self.task_table.setHorizontalHeaderLabels(
-            ["ID", "Title", "Priority", "Status", "Deadline"]
-        )  # Updated
-
-        for row, task in enumerate(sorted_tasks):
-            self.task_table.setItem(row, 0, QTableWidgetItem(str(task.id)))
-            self.task_table.setItem(row, 1, QTableWidgetItem(task.title))
-            self.task_table.setItem(row, 2, QTableWidgetItem(str(task.priority)))
-
-            # Status Column (Completed or Pending)
-            status_text = "Completed" if task.completed else "Pending"
-            status_item = QTableWidgetItem(status_text)
-            status_item.setForeground(
-                QColor("green") if task.completed else QColor("red")
-            )
-            self.task_table.setItem(row, 3, status_item)
-
-            # Handle Missing or Invalid Deadlines
-            deadline_item = QTableWidgetItem("N/A")  # Default value
-            if task.deadline and isinstance(task.deadline, str):
-                deadline_date = QDate.fromString(
-                    task.deadline, "yyyy-MM-dd"
-                )  # Convert from DB format
-                if deadline_date.isValid():
-                    formatted_deadline = deadline_date.toString(
-                        "dd-MM-yyyy"
-                    )  # Convert to desired format
-                    deadline_item.setText(formatted_deadline)
-
-                    # Apply Color Coding for Deadlines
-                    today = QDate.currentDate()
-                    if deadline_date < today:
-                        deadline_item.setForeground(QColor("red"))  # Overdue
-                    elif deadline_date <= today.addDays(6):
-                        deadline_item.setForeground(QColor("orange"))  # Due soon
-                    else:
-                        deadline_item.setForeground(QColor("green"))  # Safe
-
-            self.task_table.setItem(row, 4, deadline_item)
+        sort_key, reverse = SORT_ORDERS[self.sort_dropdown.currentIndex()]
+        self.task_model.set_sort(sort_key, reverse)
+        if self.search_bar.text().strip():
+            self.filter_tasks()
+
+    def reload_task_list(self):
+        """Reload the table after a bulk write (switching sorts may not query)"""
+        self.task_model.reload()
+        if self.search_bar.text().strip():
+            self.filter_tasks()
 
     def mark_task_complete(self):
-        selected_row = self.task_table.currentRow()
-        if selected_row >= 0:
-            task_id = int(self.task_table.item(selected_row, 0).text())
-            mark_task_complete(task_id)
-            self.update_task_list()
+        """Mark the selected tasks as completed in one batch"""
+        tasks = self.selected_tasks()
+        if tasks:
+
+            def completed(updated):
+                updated = set(updated)
+                for task in tasks:
+                    if task.id in updated:
+                        self.task_model.update_task(task, completed=True)
+
+            self.jobs.submit(
+                self.store.mark_tasks_complete,
+                [task.id for task in tasks],
+                write=True,
+                on_result=completed,
+            )
         else:
             QMessageBox.warning(
-                self, "Selection Error", "Select a task to mark as completed!"
+                self, "Selection Error", "Select tasks to mark as completed!"
             )
 
     def save_tasks(self):
         """Save tasks to a JSON file"""
         filename = "tasks.json"
-        tasks = get_all_tasks()
-        task_data = [
-            {
-                "id": task.id,
-                "title": task.title,
-                "priority": task.priority,
-                "completed": task.completed,
-                "deadline": (
-                    QDate.fromString(task.deadline, "yyyy-MM-dd").toString("dd-MM-yyyy")
-                    if task.deadline
-                    else "N/A"
-                ),
-            }
-            for task in tasks
-        ]
 
-        with open(filename, "w") as file:
-            json.dump(task_data, file, indent=4)
+        def saved(count):
+            QMessageBox.information(
+                self, "Saved", f"Tasks saved successfully to {filename}!"
+            )
 
-        QMessageBox.information(
-            self, "Saved", f"Tasks saved successfully to {filename}!"
+        self.jobs.submit(
+            self.store.export_tasks,
+            filename,
+            fmt="json",
+            on_result=saved,
+            on_progress=lambda count: self.status_label.setText(
+                f"Saved {count} tasks..."
+            ),
         )
 
     def load_tasks(self):
@@ -389,50 +364,55 @@ class ToDoApp(QWidget):
             QMessageBox.warning(self, "Error", f"No saved tasks found in {filename}!")
             return
 
-        try:
-            with open(filename, "r") as file:
-                task_data = json.load(file)
-
-            existing_tasks = {task.title for task in get_all_tasks()}
-            new_tasks = []
-
-            for task in task_data:
-                if task["title"] not in existing_tasks:
-                    # Convert "DD-MM-YYYY" back to "YYYY-MM-DD" before adding to DB
-                    deadline_qdate = QDate.fromString(
-                        task.get("deadline", ""), "dd-MM-yyyy"
-                    )
-                    deadline_str = (
-                        deadline_qdate.toString("yyyy-MM-dd")
-                        if deadline_qdate.isValid()
-                        else None
-                    )
-
-                    add_task(task["title"], task["priority"], deadline_str)
-                    new_tasks.append(task)
-
-            if new_tasks:
-                self.update_task_list()
+        def loaded(added):
+            if added:
+                self.reload_task_list()
                 QMessageBox.information(
-                    self, "Loaded", f"Added {len(new_tasks)} new tasks from {filename}!"
+                    self, "Loaded", f"Added {added} new tasks from {filename}!"
                 )
             else:
                 QMessageBox.information(self, "Loaded", "No new tasks to add.")
 
-        except json.JSONDecodeError:
-            QMessageBox.warning(
-                self, "Error", f"Failed to read {filename}! File might be corrupted."
-            )
+        def failed(error):
+            if isinstance(error, json.JSONDecodeError):
+                QMessageBox.warning(
+                    self,
+                    "Error",
+                    f"Failed to read {filename}! File might be corrupted.",
+                )
+            else:
+                self.show_error(error)
+
+        self.jobs.submit(
+            self.store.import_tasks,
+            filename,
+            write=True,
+            on_result=loaded,
+            on_error=failed,
+            on_progress=lambda added: self.status_label.setText(
+                f"Added {added} tasks..."
+            ),
+        )
 
     def delete_task(self):
-        """Delete the selected task from the database"""
-        selected_row = self.task_table.currentRow()
-        if selected_row >= 0:
-            task_id = int(self.task_table.item(selected_row, 0).text())
-            delete_task(task_id)
-            self.update_task_list()
+        """Delete the selected tasks from the database in one batch"""
+        tasks = self.selected_tasks()
+        if tasks:
+
+            def deleted(removed):
+                removed = set(removed)
+                self.task_model.remove_tasks(
+                    [task for task in tasks if task.id in removed]
+                )
+
+            self.jobs.submit(
+                self.store.delete_tasks,
+                [task.id for task in tasks],
+                write=True,
+                on_result=deleted,
+            )
         else:
-            QMessageBox.warning(self, "Selection Error", "Select a task to delete!")
+            QMessageBox.warning(self, "Selection Error", "Select tasks to delete!")
 
     def clear_all_tasks(self):
         """Clear all tasks from the database and update the UI"""
@@ -445,9 +425,12 @@ class ToDoApp(QWidget):
         )
 
         if confirmation == QMessageBox.Yes:
-            clear_all_tasks()  # Ensure this function is imported from backend.database
-            self.update_task_list()
-            QMessageBox.information(self, "Cleared", "All tasks have been deleted.")
+
+            def cleared(count):
+                self.reload_task_list()
+                QMessageBox.information(self, "Cleared", "All tasks have been deleted.")
+
+            self.jobs.submit(self.store.clear_all_tasks, write=True, on_result=cleared)
 
 
 if __name__ == "__main__":
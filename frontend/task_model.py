@@ -0,0 +1,414 @@
+"""
+Task table model for ToDoListApp.
+Serves tasks to the GUI table lazily, one page at a time.
+"""
+
+from datetime import date
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QSortFilterProxyModel, QModelIndex
+from PySide6.QtGui import QColor
+
+from backend.database import get_tasks_page
+from backend.utils import SortedViews, TitleIndex
+
+COLUMNS = ["ID", "Title", "Priority", "Status", "Deadline"]
+
+# Fields compared when another process's change to a task comes in
+FIELDS = ("title", "priority", "completed", "deadline")
+
+# Larger batches of outside changes reload the table instead
+RELOAD_THRESHOLD = 1000
+
+GREEN = QColor("green")
+ORANGE = QColor("orange")
+RED = QColor("red")
+
+
+class TaskTableModel(QAbstractTableModel):
+    """
+    Read-only table model over the tasks in the database.
+
+    Rows are loaded in pages through canFetchMore()/fetchMore() as the view
+    scrolls, and cell text and colors are computed in data() only for the
+    cells the view actually paints. With a JobRunner, pages are queried on
+    a background thread and appended when they arrive. ``fetch_page`` reads
+    a page, with get_tasks_page()'s arguments (e.g. a TaskClient's).
+
+    Loaded tasks are kept in SortedViews, presorted for every order the
+    table has been shown in. Once all tasks are loaded, set_sort() switches
+    to another order by re-binding the rows to its view, without a query.
+    """
+
+    def __init__(self, parent=None, page_size=200, jobs=None, fetch_page=None):
+        super().__init__(parent)
+        self.page_size = page_size
+        self.jobs = jobs
+        self.fetch_page = fetch_page or get_tasks_page
+        self.sort_key = "priority"
+        self.reverse = True
+        self.views = SortedViews()  # Loaded tasks, in every order used so far
+        self._tasks = self.views.view(self.sort_key, self.reverse)  # Rows
+        self.titles = TitleIndex()  # Search index over the loaded rows
+        self._exhausted = False
+        self._fetching = None  # (limit, callback) while a fetch is pending
+        self._generation = 0
+        self._today = date.today()
+        self._deadline_cache = {}
+
+    def set_sort(self, key, reverse=False):
+        """
+        Change the sort order.
+
+        With every task loaded, the rows are re-bound to the presorted view
+        for the new order. Otherwise the loaded rows are not a prefix of the
+        new order, so it reloads from the first page.
+        """
+        self.sort_key = key
+        self.reverse = reverse
+        if self._exhausted:
+            self.beginResetModel()
+            self._tasks = self.views.view(key, reverse)
+            self.endResetModel()
+        else:
+            self.reload()
+
+    def reload(self):
+        """Drop every loaded row and fetch the first page again."""
+        self.beginResetModel()
+        self.views.clear()
+        self._tasks = self.views.view(self.sort_key, self.reverse)
+        self.titles.clear()
+        self._exhausted = False
+        self._drop_pending_fetch()
+        self._today = date.today()
+        self._deadline_cache = {}
+        self.endResetModel()
+        self.fetchMore()
+
+    def task_at(self, row):
+        """Return the task shown on the given row."""
+        return self._tasks[row]
+
+    # -------------------------------------------------------------------------
+    # In-place row updates
+    # -------------------------------------------------------------------------
+
+    def insert_task(self, task):
+        """
+        Insert a new task at its sorted position.
+
+        Tasks that sort after the last loaded row are left for fetchMore()
+        to pick up, so pagination stays consistent with the database.
+
+        Returns:
+            int: The row the task was inserted at, or -1 if not loaded yet
+        """
+        if task.id in self.views:
+            # Already shown, e.g. picked up as an outside change
+            return self.row_of(task)
+        row = self._tasks.position(task)
+        if row == len(self._tasks) and not self._exhausted:
+            return -1
+
+        pending = self._cancel_pending_fetch()
+        self.titles.add(task.id, task.title)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.views.add(task)
+        self.endInsertRows()
+        if pending is not None:
+            self._request(*pending)
+        return row
+
+    def row_of(self, task):
+        """Return the row currently showing a task, or -1."""
+        shown = self.views.get(task.id)
+        return -1 if shown is None else self._tasks.row_of(shown)
+
+    def update_task(self, task, **fields):
+        """Apply field changes to a loaded task, wherever its row is now."""
+        row = self.row_of(task)
+        if row >= 0:
+            self.update_row(row, **fields)
+
+    def remove_task(self, task):
+        """Remove a loaded task, wherever its row is now."""
+        row = self.row_of(task)
+        if row >= 0:
+            self.remove_row(row)
+
+    def remove_tasks(self, tasks):
+        """Remove many loaded tasks, one row range at a time."""
+        rows = sorted(
+            (row for row in map(self.row_of, tasks) if row >= 0), reverse=True
+        )
+        if not rows:
+            return
+
+        pending = self._cancel_pending_fetch()
+        for row in rows:
+            self.titles.remove(self._tasks[row].id)
+        # Remove runs of adjacent rows from the bottom up, so the rows still
+        # to be removed keep their positions
+        last = first = rows[0]
+        for row in rows[1:] + [None]:
+            if row is not None and row == first - 1:
+                first = row
+                continue
+            ids = [self._tasks[run_row].id for run_row in range(first, last + 1)]
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for task_id in ids:
+                self.views.remove(task_id)
+            self.endRemoveRows()
+            last = first = row
+        if pending is not None:
+            self._request(*pending)
+
+    def apply_changes(self, tasks, deleted):
+        """
+        Show writes made elsewhere: changed tasks and IDs of deleted ones.
+
+        Changes this window made itself come back here too and leave the
+        rows as they are. ``tasks`` is None when changes were missed; the
+        table reloads then.
+        """
+        if tasks is None or len(tasks) + len(deleted) > RELOAD_THRESHOLD:
+            self.reload()
+            return
+
+        views = self.views
+        self.remove_tasks(
+            [views.get(task_id) for task_id in deleted if task_id in views]
+        )
+        for task in tasks:
+            shown = views.get(task.id)
+            if shown is None:
+                self.insert_task(task)
+                continue
+            fields = {
+                field: getattr(task, field)
+                for field in FIELDS
+                if getattr(task, field) != getattr(shown, field)
+            }
+            if fields:
+                self.update_task(shown, **fields)
+
+    def update_row(self, row, **fields):
+        """Apply field changes to the task on a row and repaint it."""
+        task = self._tasks[row]
+        if self.sort_key in fields:
+            # The task may belong somewhere else now
+            self.remove_row(row)
+            for key, value in fields.items():
+                setattr(task, key, value)
+            self.insert_task(task)
+            return
+
+        # Moves the task in the other orders' views
+        self.views.update(task.id, **fields)
+        if "title" in fields:
+            self.titles.add(task.id, task.title)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(COLUMNS) - 1))
+
+    def remove_row(self, row):
+        """Remove the task on a row."""
+        pending = self._cancel_pending_fetch()
+        task_id = self._tasks[row].id
+        self.titles.remove(task_id)
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self.views.remove(task_id)
+        self.endRemoveRows()
+        if pending is not None:
+            self._request(*pending)
+
+    # -------------------------------------------------------------------------
+    # Lazy loading
+    # -------------------------------------------------------------------------
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted or self._fetching is not None:
+            return
+        self._request(self.page_size)
+
+    def fetch_all(self, callback=None):
+        """Load every remaining row, then call callback()."""
+        if self._exhausted:
+            if callback is not None:
+                callback()
+            return
+        self._drop_pending_fetch()
+        self._request(None, callback)
+
+    def _request(self, limit, callback=None):
+        """Query the rows after the last loaded one."""
+        self._fetching = (limit, callback)
+        generation = self._generation
+        after = None
+        if self._tasks:
+            # Pass the keyset values, not the task the GUI may still edit
+            last = self._tasks[-1]
+            after = (getattr(last, self.sort_key), last.id)
+        query = dict(key=self.sort_key, reverse=self.reverse, after=after, limit=limit)
+
+        def loaded(page):
+            if generation != self._generation:
+                return
+            self._fetching = None
+            self._append(page, limit)
+            if callback is not None:
+                callback()
+
+        def failed(error):
+            if generation == self._generation:
+                self._fetching = None
+            if self.jobs is not None:
+                self.jobs.error.emit(error)
+
+        if self.jobs is None:
+            loaded(self.fetch_page(**query))
+        else:
+            self.jobs.submit(
+                self.fetch_page, group=self, on_result=loaded, on_error=failed, **query
+            )
+
+    def _append(self, page, limit):
+        if limit is None or len(page) < limit:
+            self._exhausted = True
+        # Skip tasks an outside change already put in
+        page = [task for task in page if task.id not in self.views]
+        if page:
+            self.titles.add_tasks(page)
+            first = len(self._tasks)
+            self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+            self.views.add_tasks(page)
+            self.endInsertRows()
+
+    def _drop_pending_fetch(self):
+        """Ignore the result of a fetch that is still running."""
+        self._generation += 1
+        self._fetching = None
+        if self.jobs is not None:
+            self.jobs.cancel(self)
+
+    def _cancel_pending_fetch(self):
+        """
+        Cancel a pending fetch that may have read rows before they changed.
+
+        Returns:
+            tuple: The (limit, callback) to request again, or None
+        """
+        pending = self._fetching
+        if pending is not None:
+            self._drop_pending_fetch()
+        return pending
+
+    # -------------------------------------------------------------------------
+    # QAbstractTableModel interface
+    # -------------------------------------------------------------------------
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._tasks)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return COLUMNS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        task = self._tasks[index.row()]
+        column = index.column()
+
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return str(task.id)
+            if column == 1:
+                return task.title
+            if column == 2:
+                return str(task.priority)
+            if column == 3:
+                return "Completed" if task.completed else "Pending"
+            if column == 4:
+                return self._deadline(task.deadline)[0]
+
+        elif role == Qt.ForegroundRole:
+            if column == 3:
+                return GREEN if task.completed else RED
+            if column == 4:
+                return self._deadline(task.deadline)[1]
+
+        return None
+
+    def _deadline(self, deadline):
+        """
+        Return the display text and color for a deadline date.
+
+        Computed once per distinct deadline until the next reload(), so
+        painting a cell is a dict lookup.
+        """
+        cached = self._deadline_cache.get(deadline)
+        if cached is not None:
+            return cached
+
+        # Handle Missing Deadlines
+        result = ("N/A", None)
+        if deadline is not None:
+            # Apply Color Coding for Deadlines
+            days_left = (deadline - self._today).days
+            if days_left < 0:
+                color = RED  # Overdue
+            elif days_left <= 6:
+                color = ORANGE  # Due soon
+            else:
+                color = GREEN  # Safe
+            result = (deadline.strftime("%d-%m-%Y"), color)
+
+        self._deadline_cache[deadline] = result
+        return result
+
+
+class TaskFilterModel(QSortFilterProxyModel):
+    """
+    Hides the rows whose title does not contain the search text.
+
+    Matches are computed in one go from the source model's TitleIndex, and
+    rows added, renamed or removed while a search is active are checked as
+    they are indexed.
+    """
+
+    def __init__(self, source, parent=None):
+        super().__init__(parent)
+        self.setSourceModel(source)
+        self._needle = ""
+        self._matches = None  # None = show every row
+        source.titles.listeners.append(self._title_indexed)
+
+    def set_search(self, text):
+        """Show only tasks whose title contains text (case-insensitive)."""
+        self._needle = TitleIndex.fold(text)
+        if self._needle:
+            self._matches = self.sourceModel().titles.search(self._needle)
+        else:
+            self._matches = None
+        self.invalidateRowsFilter()
+
+    def _title_indexed(self, task_id, folded):
+        if self._matches is None:
+            return
+        if folded is not None and self._needle in folded:
+            self._matches.add(task_id)
+        else:
+            # Renamed away from the search text, or removed
+            self._matches.discard(task_id)
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self._matches is None:
+            return True
+        return self.sourceModel().task_at(source_row).id in self._matches
@@ -0,0 +1,160 @@
+"""
+Theme support for ToDoListApp.
+Detects the system color scheme and holds the stylesheet for each theme.
+"""
+
+import sys
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QGuiApplication, QPalette
+
+DARK_STYLE = """
+QWidget { background-color: #2E2E2E; color: white; }
+
+QPushButton {
+    background-color: #444;
+    color: white;
+    border-radius: 8px;
+    padding: 8px;
+    font-size: 14px;
+    border: 1px solid #666;
+}
+QPushButton:hover { background-color: #555; }
+QPushButton:pressed { background-color: #666; }
+QPushButton#delete_task_button { background-color: #D9534F; }
+QPushButton#delete_task_button:hover { background-color: #C9302C; }
+QPushButton#complete_task_button { background-color: #5CB85C; }
+QPushButton#complete_task_button:hover { background-color: #4CAE4C; }
+
+QTableView {
+    background-color: #3A3A3A;
+    color: white;
+    gridline-color: #555;
+    selection-background-color: #555;
+}
+QHeaderView::section {
+    background-color: #444;
+    padding: 5px;
+    font-weight: bold;
+    border: 1px solid #666;
+}
+
+QComboBox, QDateEdit, QLineEdit {
+    background-color: #3A3A3A;
+    color: white;
+    border-radius: 6px;
+    padding: 6px;
+    border: 1px solid #666;
+    font-size: 14px;
+}
+QComboBox:hover, QDateEdit:hover, QLineEdit:hover { border: 1px solid #888; }
+QComboBox QAbstractItemView {
+    background-color: #3A3A3A;
+    selection-background-color: #555;
+    border-radius: 6px;
+}
+QLineEdit:focus {
+    border: 2px solid #1DB954;
+    background-color: #444;
+}
+QLineEdit#search_bar {
+    border: 2px solid #555;
+    border-radius: 8px;
+}
+QLineEdit#search_bar:focus { border: 2px solid #1DB954; }
+"""
+
+LIGHT_STYLE = """
+QWidget { background-color: #F5F5F5; color: black; }
+
+QPushButton {
+    background-color: #E0E0E0;
+    color: black;
+    border-radius: 8px;
+    padding: 8px;
+    font-size: 14px;
+    border: 1px solid #BDBDBD;
+}
+QPushButton:hover { background-color: #D6D6D6; }
+QPushButton:pressed { background-color: #BDBDBD; }
+QPushButton#delete_task_button { background-color: #FF6B6B; }
+QPushButton#delete_task_button:hover { background-color: #FF3B3B; }
+QPushButton#complete_task_button { background-color: #4CAF50; }
+QPushButton#complete_task_button:hover { background-color: #45A049; }
+
+QTableView {
+    background-color: white;
+    color: black;
+    gridline-color: #CCC;
+    selection-background-color: #D6D6D6;
+}
+QHeaderView::section {
+    background-color: #E0E0E0;
+    padding: 5px;
+    font-weight: bold;
+    border: 1px solid #BDBDBD;
+}
+
+QComboBox, QDateEdit, QLineEdit {
+    background-color: #FFFFFF;
+    color: black;
+    border-radius: 6px;
+    padding: 6px;
+    border: 1px solid #BDBDBD;
+    font-size: 14px;
+}
+QComboBox:hover, QDateEdit:hover, QLineEdit:hover { border: 1px solid #888; }
+QComboBox QAbstractItemView {
+    background-color: #F5F5F5;
+    selection-background-color: #D6D6D6;
+    border-radius: 6px;
+}
+QLineEdit:focus {
+    border: 2px solid #1DB954;
+    background-color: #F0F0F0;
+}
+QLineEdit#search_bar {
+    border: 2px solid #BDBDBD;
+    border-radius: 8px;
+}
+QLineEdit#search_bar:focus { border: 2px solid #1DB954; }
+"""
+
+# Stylesheet per theme, keyed by "is dark"
+STYLESHEETS = {True: DARK_STYLE, False: LIGHT_STYLE}
+
+
+def is_windows_dark_mode():
+    """Detect Windows dark mode setting."""
+    try:
+        import winreg  # Windows only, and only needed here
+    except ImportError:
+        return False
+    try:
+        registry = winreg.ConnectRegistry(None, winreg.HKEY_CURRENT_USER)
+        key = winreg.OpenKey(
+            registry,
+            r"Software\Microsoft\Windows\CurrentVersion\Themes\Personalize",
+        )
+        value, _ = winreg.QueryValueEx(key, "AppsUseLightTheme")
+        winreg.CloseKey(key)
+        return value == 0
+    except (FileNotFoundError, OSError, PermissionError):
+        return False
+
+
+def is_dark_mode():
+    """
+    Detect whether the system uses a dark color scheme.
+
+    Uses Qt's color scheme when the platform reports one, then the Windows
+    registry, then the lightness of the default window palette.
+    """
+    scheme = QGuiApplication.styleHints().colorScheme()
+    if scheme == Qt.ColorScheme.Dark:
+        return True
+    if scheme == Qt.ColorScheme.Light:
+        return False
+    if sys.platform == "win32":
+        return is_windows_dark_mode()
+    return QGuiApplication.palette().color(QPalette.Window).lightness() < 128
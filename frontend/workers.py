@@ -0,0 +1,185 @@
+"""
+Background job layer for ToDoListApp.
+Runs database calls on QThreadPool workers and reports back on the GUI thread.
+"""
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+
+class WorkerSignals(QObject):
+    """Signals a Worker emits; each carries the worker that sent it."""
+
+    result = Signal(object, object)  # worker, return value
+    error = Signal(object, object)  # worker, exception
+    progress = Signal(object, object)  # worker, progress value
+    finished = Signal(object)  # worker
+
+
+class Worker(QRunnable):
+    """Runs one function call on a pool thread."""
+
+    def __init__(self, fn, args, kwargs, with_progress=False):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.with_progress = with_progress
+        self.cancelled = False
+        self.signals = WorkerSignals()
+
+    def cancel(self):
+        """Drop the result; the call itself cannot be interrupted once started."""
+        self.cancelled = True
+
+    def _emit(self, signal, *args):
+        try:
+            signal.emit(self, *args)
+        except RuntimeError:
+            # The signals object was deleted because the app is shutting down
+            self.cancelled = True
+
+    def _report(self, value):
+        if not self.cancelled:
+            self._emit(self.signals.progress, value)
+
+    def run(self):
+        try:
+            if self.cancelled:
+                return
+            kwargs = self.kwargs
+            if self.with_progress:
+                kwargs = dict(kwargs, progress=self._report)
+            value = self.fn(*self.args, **kwargs)
+        except Exception as e:
+            if not self.cancelled:
+                self._emit(self.signals.error, e)
+        else:
+            if not self.cancelled:
+                self._emit(self.signals.result, value)
+        finally:
+            self._emit(self.signals.finished)
+
+
+class JobRunner(QObject):
+    """
+    Submits database calls to background threads.
+
+    Reads run on a shared pool. Writes run one at a time on their own pool,
+    so they reach the database in the order they were submitted. Callbacks
+    are always invoked on the thread that owns the runner (the GUI thread).
+    """
+
+    busy_changed = Signal(bool)
+    error = Signal(object)  # exceptions from jobs without an on_error callback
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.read_pool = QThreadPool(self)
+        self.write_pool = QThreadPool(self)
+        self.write_pool.setMaxThreadCount(1)
+        self._callbacks = {}
+        self._groups = {}
+        self._quiet = set()  # Jobs that do not count as busy
+
+    def submit(
+        self,
+        fn,
+        *args,
+        write=False,
+        group=None,
+        quiet=False,
+        on_result=None,
+        on_error=None,
+        on_progress=None,
+        **kwargs,
+    ):
+        """
+        Run fn(*args, **kwargs) in the background.
+
+        Args:
+            write: True for calls that modify the database
+            group: Submitting a job in the same group cancels the previous
+                one, e.g. a refresh superseded by a newer refresh
+            quiet: True for routine background checks that should not show
+                as busy (busy_changed and is_busy() ignore them)
+            on_result: Called with the return value
+            on_error: Called with the exception (default: the error signal)
+            on_progress: Called with progress values; fn is then passed a
+                ``progress`` callback keyword argument
+
+        Returns:
+            Worker: The queued job
+        """
+        if group is not None:
+            self.cancel(group)
+
+        worker = Worker(fn, args, kwargs, with_progress=on_progress is not None)
+        worker.signals.result.connect(self._on_result)
+        worker.signals.error.connect(self._on_error)
+        worker.signals.progress.connect(self._on_progress)
+        worker.signals.finished.connect(self._on_finished)
+
+        was_busy = self.is_busy()
+        self._callbacks[worker] = (group, on_result, on_error, on_progress)
+        if quiet:
+            self._quiet.add(worker)
+        if group is not None:
+            self._groups[group] = worker
+        (self.write_pool if write else self.read_pool).start(worker)
+        if not was_busy and not quiet:
+            self.busy_changed.emit(True)
+        return worker
+
+    def cancel(self, group):
+        """Cancel the pending job of a group, if any."""
+        worker = self._groups.pop(group, None)
+        if worker is None:
+            return
+        worker.cancel()
+        if self.read_pool.tryTake(worker) or self.write_pool.tryTake(worker):
+            # Never started, so it will not report finished itself
+            self._on_finished(worker)
+
+    def is_busy(self):
+        """True while any job (other than quiet ones) is queued or running."""
+        return len(self._callbacks) > len(self._quiet)
+
+    def wait(self, msecs=-1):
+        """Block until every job has finished (for shutdown and tests)."""
+        return self.write_pool.waitForDone(msecs) and self.read_pool.waitForDone(msecs)
+
+    @Slot(object, object)
+    def _on_result(self, worker, value):
+        callbacks = self._callbacks.get(worker)
+        if callbacks and callbacks[1] is not None and not worker.cancelled:
+            callbacks[1](value)
+
+    @Slot(object, object)
+    def _on_error(self, worker, error):
+        callbacks = self._callbacks.get(worker)
+        if not callbacks or worker.cancelled:
+            return
+        if callbacks[2] is not None:
+            callbacks[2](error)
+        else:
+            self.error.emit(error)
+
+    @Slot(object, object)
+    def _on_progress(self, worker, value):
+        callbacks = self._callbacks.get(worker)
+        if callbacks and callbacks[3] is not None and not worker.cancelled:
+            callbacks[3](value)
+
+    @Slot(object)
+    def _on_finished(self, worker):
+        callbacks = self._callbacks.pop(worker, None)
+        if callbacks is None:
+            return
+        group = callbacks[0]
+        if group is not None and self._groups.get(group) is worker:
+            del self._groups[group]
+        if worker in self._quiet:
+            self._quiet.discard(worker)
+        elif not self.is_busy():
+            self.busy_changed.emit(False)
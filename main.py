@@ -4,48 +4,137 @@ ToDoListApp - Main Entry Point
 
 A simple yet powerful task management application.
 Run this file to start the app: python main.py
+
+Run it with a command (add, bulk-add, list, complete, delete, export,
+stats) to manage tasks from the shell without loading Qt; see
+``python main.py --help`` and frontend/cli.py.
+
+Run with --server URL (or set TODO_SERVER_URL) to keep tasks on a task
+server started with ``python main.py serve`` instead of the local file.
+
+Run with --profile-startup to print a timing breakdown of startup and exit
+as soon as the first page of tasks has been loaded.
 """
 
+import os
 import sys
+import time
 import logging
 
-from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import Qt
-
 # Set up logging
 logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
 
 
+class StartupProfiler:
+    """Records how long each startup phase takes (no-op when disabled)."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.start = self.last = time.perf_counter()
+        self.phases = []
+
+    def mark(self, phase):
+        """Close the current phase under the given name."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def report(self, file=sys.stderr):
+        """Print the breakdown and the total."""
+        print("Startup profile:", file=file)
+        for phase, seconds in self.phases:
+            print(f"  {phase:<32} {seconds * 1000:8.1f} ms", file=file)
+        total = self.last - self.start
+        print(f"  {'total':<32} {total * 1000:8.1f} ms", file=file)
+
+
 def main():
     """Initialize and run the ToDoListApp."""
+    from frontend import cli
+
+    if cli.is_cli(sys.argv[1:]):
+        sys.exit(cli.main(sys.argv[1:]))
+
+    profile_startup = "--profile-startup" in sys.argv
+    if profile_startup:
+        sys.argv.remove("--profile-startup")
+    profiler = StartupProfiler(profile_startup)
+
+    server_url = os.getenv("TODO_SERVER_URL")
+    if "--server" in sys.argv:
+        index = sys.argv.index("--server")
+        if index + 1 >= len(sys.argv):
+            sys.exit("main.py: --server needs a URL")
+        server_url = sys.argv[index + 1]
+        del sys.argv[index : index + 2]
+
     logger.info("Starting ToDoListApp...")
-    
+
+    # Qt is imported here so the profile can time it
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtCore import Qt, QTimer
+
+    profiler.mark("import PySide6")
+
     # Enable High DPI scaling for Windows 11
     QApplication.setHighDpiScaleFactorRoundingPolicy(
         Qt.HighDpiScaleFactorRoundingPolicy.PassThrough
     )
-    
+
     # Create the application
     app = QApplication(sys.argv)
     app.setApplicationName("ToDoListApp")
     app.setApplicationVersion("1.0.0")
-    
+    profiler.mark("QApplication()")
+
     # Import here to avoid circular imports
+    import backend.database  # noqa: F401 - timed separately from the GUI
+
+    profiler.mark("import backend.database")
     from frontend.gui import ToDoApp
-    
+
+    profiler.mark("import frontend.gui")
+
+    store = None
+    if server_url:
+        from backend.client import TaskClient
+
+        store = TaskClient(server_url)
+        logger.info("Using the task server at %s", server_url)
+
     # Create and show the main window
-    window = ToDoApp()
+    window = ToDoApp(store)
+    profiler.mark("ToDoApp()")
     window.show()
-    
+    profiler.mark("show()")
+
     logger.info("Application window opened")
-    
+
+    if profile_startup:
+        # The first page is queried in the background (after the schema
+        # check); report once it has arrived and been painted
+        def first_page_loaded(busy):
+            if busy:
+                return
+            window.jobs.busy_changed.disconnect(first_page_loaded)
+            app.processEvents()
+            profiler.mark("first page (schema + query)")
+            profiler.report()
+            QTimer.singleShot(0, app.quit)
+
+        if window.jobs.is_busy():
+            window.jobs.busy_changed.connect(first_page_loaded)
+        else:
+            first_page_loaded(False)
+
     # Run the app
     sys.exit(app.exec())
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,25 @@
+"""
+Shared fixtures for the ToDoListApp tests.
+
+backend.database binds to TODO_DB_PATH when it is imported, so the tests
+point it at a temporary file before anything imports the backend.
+"""
+
+import os
+import tempfile
+
+import pytest
+
+_TMP = tempfile.mkdtemp(prefix="todo-tests-")
+os.environ["TODO_DB_PATH"] = os.path.join(_TMP, "tasks.db")
+
+from backend import database  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    """The backend.database module over an empty task table."""
+    database.init_db()
+    database.clear_all_tasks()
+    yield database
+    database.disable_cache()
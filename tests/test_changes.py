@@ -0,0 +1,49 @@
+"""Tests for change tracking across connections (backend.database)."""
+
+import sqlite3
+
+from sqlalchemy import func, select
+
+
+def _write_elsewhere(db, title):
+    """Add a task through a connection of its own, like another process."""
+    conn = sqlite3.connect(db.DATABASE_PATH)
+    with conn:
+        conn.execute(
+            "INSERT INTO tasks (title, priority, completed, content_hash) "
+            "VALUES (?, 1, 0, ?)",
+            (title, db.content_hash(title)),
+        )
+    conn.close()
+
+
+def test_watcher_reports_writes_made_before_its_first_poll(db):
+    watcher = db.ChangeWatcher(since=db.change_seq())
+    db.get_tasks_page()  # The first load
+    _write_elsewhere(db, "Added while loading")
+
+    tasks, deleted = watcher.poll()
+    watcher.close()
+
+    assert [task.title for task in tasks] == ["Added while loading"]
+    assert deleted == []
+
+
+def test_change_log_is_pruned(db):
+    since = db.change_seq()
+    count = db.CHANGE_LOG_KEEP + 2 * db.CHANGE_LOG_PRUNE_EVERY
+    ids = db.add_tasks({"title": f"Task {i}"} for i in range(count))
+    db.delete_tasks(ids)
+
+    with db.get_db() as session:
+        entries = session.scalar(select(func.count()).select_from(db.TaskChange))
+    assert entries <= db.CHANGE_LOG_KEEP + db.CHANGE_LOG_PRUNE_EVERY
+
+    # A reader further behind is told to read everything again
+    seq, tasks, deleted = db.get_changes(since)
+    assert seq == db.change_seq()
+    assert tasks is None
+
+    # One within the kept window still gets every change
+    seq, tasks, deleted = db.get_changes(seq - 10)
+    assert tasks == [] and len(deleted) == 10
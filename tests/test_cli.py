@@ -0,0 +1,50 @@
+"""Tests for the command-line interface."""
+
+from datetime import date
+import io
+
+from frontend import cli
+
+
+def test_is_cli_after_global_flags():
+    assert cli.is_cli(["list"])
+    assert cli.is_cli(["-v", "list", "--pending"])
+    assert cli.is_cli(["--verbose", "--help"])
+
+
+def test_is_cli_without_command_opens_the_app():
+    assert not cli.is_cli([])
+    assert not cli.is_cli(["-v"])
+    assert not cli.is_cli(["--server", "http://127.0.0.1:8765"])
+    assert not cli.is_cli(["--profile-startup"])
+
+
+def test_export_output_round_trips_through_bulk_add(db):
+    db.add_task("Dated", priority=3, deadline=date(2026, 5, 1))
+    db.add_task("Undated")
+    exported = io.StringIO()
+    assert cli.main(["export", "-"], stdout=exported) == 0
+
+    db.clear_all_tasks()
+    added = io.StringIO()
+    status = cli.main(
+        ["bulk-add", "--ndjson"], stdin=io.StringIO(exported.getvalue()), stdout=added
+    )
+
+    assert status == 0
+    assert len(added.getvalue().split()) == 2
+    tasks = {task.title: task for task in db.get_all_tasks()}
+    assert tasks["Dated"].deadline == date(2026, 5, 1)
+    assert tasks["Dated"].priority == 3
+    assert tasks["Undated"].deadline is None
+
+
+def test_bulk_add_reports_a_bad_deadline(db, capsys):
+    line = '{"title": "Bad", "deadline": "someday"}\n'
+    status = cli.main(
+        ["bulk-add", "--ndjson"], stdin=io.StringIO(line), stdout=io.StringIO()
+    )
+
+    assert status == 1
+    assert "someday" in capsys.readouterr().err
+    assert db.get_all_tasks() == []
@@ -0,0 +1,99 @@
+"""Tests for backend.client against an in-process backend.server."""
+
+from datetime import date, timedelta
+from http import HTTPStatus
+from http.client import HTTPConnection
+import threading
+
+import pytest
+
+from backend import server
+from backend.client import TaskClient
+from backend.server import TaskServer
+
+
+@pytest.fixture
+def client(db):
+    server = TaskServer(("127.0.0.1", 0))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    client = TaskClient(f"http://{host}:{port}")
+    yield client
+    client.close()
+    server.shutdown()
+    server.server_close()
+
+
+def test_query_task_stats_repeated_without_changes(client):
+    client.add_task("Numbered", priority=2)
+    client.add_tasks([{"title": "Unranked", "priority": None}])
+
+    first = client.query_task_stats()
+    # Answered with a 304 from the client's cached body
+    second = client.query_task_stats()
+
+    assert first == second
+    assert first["by_priority"] == {2: 1, None: 1}
+
+
+class _Tomorrow(date):
+    @classmethod
+    def today(cls):
+        return date.today() + timedelta(days=1)
+
+
+def test_stats_etag_changes_with_the_date(client, monkeypatch):
+    conn = HTTPConnection(client.host, client.port)
+    conn.request("GET", "/stats?days=7")
+    response = conn.getresponse()
+    response.read()
+    etag = response.getheader("ETag")
+
+    conn.request("GET", "/stats?days=7", headers={"If-None-Match": etag})
+    response = conn.getresponse()
+    response.read()
+    assert response.status == HTTPStatus.NOT_MODIFIED
+
+    # No writes, but overdue counts move on at midnight
+    monkeypatch.setattr(server, "date", _Tomorrow)
+    conn.request("GET", "/stats?days=7", headers={"If-None-Match": etag})
+    response = conn.getresponse()
+    response.read()
+    assert response.status == HTTPStatus.OK
+    conn.close()
+
+
+def test_remote_watcher_reports_writes_before_its_first_poll(client):
+    watcher = client.watch(since=client.change_seq())
+    client.add_task("Added while loading")
+
+    tasks, deleted = watcher.poll()
+
+    assert [task.title for task in tasks] == ["Added while loading"]
+    assert deleted == []
+
+
+def test_invalid_deadline_is_a_bad_request(client):
+    task = client.add_task("Dated", deadline=date(2026, 5, 1))
+    connection = HTTPConnection(client.host, client.port)
+    requests = [
+        ("POST", "/tasks", '{"title": "Bad", "deadline": "01-05-2026"}'),
+        ("POST", "/tasks", '[{"title": "Bad", "deadline": "someday"}]'),
+        ("PATCH", f"/tasks/{task['id']}", '{"deadline": 20260501}'),
+        (
+            "POST",
+            "/tasks/update",
+            f'{{"ids": [{task["id"]}], "fields": {{"deadline": "x"}}}}',
+        ),
+    ]
+    for method, path, body in requests:
+        connection.request(method, path, body, {"Content-Type": "application/json"})
+        response = connection.getresponse()
+        payload = response.read().decode()
+        assert response.status == HTTPStatus.BAD_REQUEST, (method, path, payload)
+        assert "deadline" in payload and "[SQL:" not in payload
+    connection.close()
+
+    assert [t.title for t in client.iter_tasks()] == ["Dated"]
+    assert client.get_task_by_id(task["id"]).deadline == date(2026, 5, 1)
@@ -0,0 +1,122 @@
+"""Tests for backend.database's task reads and writes."""
+
+from datetime import date, timedelta
+import sqlite3
+
+import pytest
+
+from backend.transfer import import_records
+from backend.utils import get_task_stats
+
+
+def test_add_tasks_returns_ids_in_input_order(db):
+    before = db.add_task("Before")
+
+    titles = [f"Task {i}" for i in range(25)]
+    ids = db.add_tasks(({"title": title} for title in titles), batch_size=10)
+
+    assert len(set(ids)) == len(titles)
+    assert before["id"] not in ids
+    assert [db.get_task_by_id(task_id).title for task_id in ids] == titles
+
+
+def test_fulltext_search_and_substring_fallback(db, monkeypatch):
+    db.add_tasks(
+        {"title": title}
+        for title in ["Write the report", "Review reports", "Café visit", "Rewrite"]
+    )
+    assert db.FTS_AVAILABLE
+
+    def titles(query, mode):
+        return sorted(task.title for task in db.search_tasks(query, mode=mode))
+
+    # Words match by prefix, every word must match, accents are folded
+    assert titles("report", "fulltext") == ["Review reports", "Write the report"]
+    assert titles("rev rep", "fulltext") == ["Review reports"]
+    assert titles("cafe", "fulltext") == ["Café visit"]
+    # A renamed title leaves the index
+    task = db.search_tasks("review", mode="fulltext")[0]
+    db.update_task(task.id, title="Archive")
+    assert titles("review", "fulltext") == []
+
+    # Without FTS5, "fulltext" falls back to a case-insensitive substring
+    monkeypatch.setattr(db, "FTS_AVAILABLE", False)
+    assert titles("WRITE", "fulltext") == ["Rewrite", "Write the report"]
+    assert titles("WRITE", "fulltext") == titles("WRITE", "substring")
+
+
+def test_read_cache_follows_writes_by_other_connections(db):
+    cache = db.enable_cache()
+    first, second = db.add_tasks([{"title": "First"}, {"title": "Second"}])
+    watcher = db.ChangeWatcher(since=db.change_seq())
+    db.get_task_by_id(first)
+    db.get_task_by_id(second)
+    db.get_all_tasks()
+
+    # Another process renames one task
+    with sqlite3.connect(db.DATABASE_PATH) as other:
+        other.execute("UPDATE tasks SET title = 'Renamed' WHERE id = ?", (first,))
+    other.close()
+
+    tasks, deleted = watcher.poll()
+    watcher.close()
+    assert [task.id for task in tasks] == [first] and deleted == []
+
+    hits = cache.hits
+    assert db.get_task_by_id(first).title == "Renamed"
+    assert db.get_task_by_id(second).title == "Second"
+    assert cache.hits == hits + 1  # Only the unchanged task was served cached
+    assert [task.title for task in db.get_all_tasks()] == ["Renamed", "Second"]
+
+
+def test_stats_counters_match_a_scan(db):
+    today = date.today()
+    ids = db.add_tasks(
+        {
+            "title": f"Task {i}",
+            "priority": [1, 2, 3, None][i % 4],
+            "deadline": today + timedelta(days=i - 5) if i % 3 else None,
+        }
+        for i in range(12)
+    )
+
+    def assert_counts_match():
+        expected = get_task_stats(db.get_all_tasks())
+        assert db.query_task_stats() == expected
+        assert db.query_task_stats(days=2) == get_task_stats(db.get_all_tasks(), 2)
+
+    db.enable_stats_counters()  # Seeded from the tasks already there
+    try:
+        assert_counts_match()
+        db.add_task("Overdue", priority=3, deadline=today - timedelta(days=1))
+        db.mark_tasks_complete(ids[:4])
+        db.update_task(ids[5], priority=1, deadline=today)
+        db.update_tasks(ids[6:9], deadline=None)
+        db.delete_tasks(ids[9:])
+        assert_counts_match()
+        db.clear_all_tasks()
+        assert_counts_match()
+    finally:
+        db.disable_stats_counters()
+
+
+def test_update_task_only_changes_whitelisted_fields(db):
+    task = db.add_task("Original", priority=1)
+    other = db.add_task("Other")
+
+    for fields in (
+        {"id": other["id"]},
+        {"content_hash": 0},
+        {"title": "X", "owner": 1},
+    ):
+        with pytest.raises(ValueError, match="Cannot update task fields"):
+            db.update_task(task["id"], **fields)
+        with pytest.raises(ValueError, match="Cannot update task fields"):
+            db.update_tasks([task["id"]], **fields)
+    assert db.get_task_by_id(task["id"]).to_dict() == task
+
+    assert db.update_task(task["id"], title="Renamed", priority=3, completed=1)
+    updated = db.get_task_by_id(task["id"])
+    assert (updated.title, updated.priority, updated.completed) == ("Renamed", 3, True)
+    # The derived content_hash follows the title, so imports see the rename
+    assert import_records([{"title": "Renamed"}, {"title": "Original"}]) == 1
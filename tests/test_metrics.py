@@ -0,0 +1,67 @@
+"""Tests for backend.metrics' slow-query log."""
+
+import asyncio
+import copy
+
+import pytest
+
+from backend import aio, metrics
+
+
+@pytest.fixture
+def slow_log(db):
+    """Metrics on, with every statement logged as slow."""
+    metrics.reset()
+    metrics.enable(slow_query_ms=0)
+    yield metrics
+    metrics.disable()
+    metrics.reset()
+
+
+def _plans(statement_start):
+    return [
+        query["plan"]
+        for query in metrics.snapshot()["slow_queries"]
+        if query["statement"].startswith(statement_start)
+    ]
+
+
+def test_slow_query_plan(slow_log, db):
+    db.add_task("Sync")
+    assert db.get_all_tasks()[0].title == "Sync"
+
+    plans = _plans("SELECT")
+    assert plans and all(plans)
+    assert not _plans("EXPLAIN")
+
+
+def test_slow_query_plan_async(slow_log):
+    async def run():
+        try:
+            await aio.add_task("Async")
+            return await aio.get_all_tasks()
+        finally:
+            await aio.dispose()
+
+    tasks = asyncio.run(run())
+
+    assert [task.title for task in tasks] == ["Async"]
+    plans = _plans("SELECT")
+    assert plans and all(plans)
+
+
+def test_failed_statement_leaves_no_timing_state(slow_log, db):
+    from sqlalchemy import text
+    from sqlalchemy.exc import OperationalError
+
+    with db.engine.connect() as conn:
+        info = copy.deepcopy(conn.info)
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM no_such_table"))
+        assert conn.info == info
+        conn.execute(text("SELECT 1"))
+        conn.execute(text("SELECT 2"))
+
+    timed = [query["statement"] for query in metrics.snapshot()["slow_queries"]]
+    assert timed[-2:] == ["SELECT 1", "SELECT 2"]
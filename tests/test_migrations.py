@@ -0,0 +1,166 @@
+"""
+Tests for upgrading database files written by older versions.
+
+Each test seeds a file with an old schema through sqlite3, then opens it
+with backend.database in a subprocess (the module binds to TODO_DB_PATH
+on import) and checks the result.
+"""
+
+from datetime import date
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+from backend.database import SCHEMA_VERSION, day_number
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The tasks table and title index as versions 1 and 2 created them
+V1_SCHEMA = """
+CREATE TABLE tasks (
+    id INTEGER NOT NULL,
+    title VARCHAR NOT NULL,
+    priority INTEGER,
+    completed BOOLEAN,
+    deadline VARCHAR,
+    PRIMARY KEY (id)
+);
+CREATE INDEX ix_tasks_deadline ON tasks (deadline);
+CREATE INDEX ix_tasks_completed_deadline ON tasks (completed, deadline);
+CREATE VIRTUAL TABLE tasks_fts USING fts5(
+    title, content='tasks', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER tasks_fts_insert AFTER INSERT ON tasks BEGIN
+    INSERT INTO tasks_fts(rowid, title) VALUES (new.id, new.title);
+END;
+CREATE TRIGGER tasks_fts_delete AFTER DELETE ON tasks BEGIN
+    INSERT INTO tasks_fts(tasks_fts, rowid, title)
+    VALUES ('delete', old.id, old.title);
+END;
+CREATE TRIGGER tasks_fts_update AFTER UPDATE OF title ON tasks BEGIN
+    INSERT INTO tasks_fts(tasks_fts, rowid, title)
+    VALUES ('delete', old.id, old.title);
+    INSERT INTO tasks_fts(rowid, title) VALUES (new.id, new.title);
+END;
+"""
+
+V2_SCHEMA = (
+    V1_SCHEMA.replace(
+        "deadline VARCHAR,\n", "deadline VARCHAR,\n    content_hash INTEGER,\n"
+    )
+    + """
+CREATE INDEX ix_tasks_content_hash ON tasks (content_hash);
+CREATE TABLE task_counts (
+    priority INTEGER, completed BOOLEAN, deadline VARCHAR, count INTEGER NOT NULL
+);
+CREATE TRIGGER task_counts_insert AFTER INSERT ON tasks BEGIN
+    UPDATE task_counts SET count = count + 1
+    WHERE priority IS new.priority AND completed IS new.completed
+    AND deadline IS new.deadline;
+    INSERT INTO task_counts (priority, completed, deadline, count)
+    SELECT new.priority, new.completed, new.deadline, 1
+    WHERE NOT EXISTS (
+        SELECT 1 FROM task_counts WHERE priority IS new.priority
+        AND completed IS new.completed AND deadline IS new.deadline
+    );
+END;
+"""
+)
+
+# (title, priority, completed, stored deadline, deadline after migrating)
+TASKS = [
+    ("Write report", 3, 0, "2026-01-05", date(2026, 1, 5)),
+    ("Buy milk", 1, 1, None, None),
+    ("Résumé review", 2, 0, "2025-12-31", date(2025, 12, 31)),
+    ("Old note", 1, 0, "", None),
+    ("Broken date", 2, 0, "2026-02-30", None),
+]
+
+CHECK = """
+import json
+from backend import database
+
+database.init_db()
+found = database.search_tasks("resume rev", "fulltext")
+print(json.dumps({
+    "version": database.schema_version(),
+    "search": sorted(task.title for task in found),
+    "stats": database.query_task_stats(),
+}))
+"""
+
+
+def _seed(path, schema, with_hash):
+    conn = sqlite3.connect(path)
+    conn.executescript(schema)
+    with conn:
+        for title, priority, completed, deadline, _ in TASKS:
+            if with_hash:
+                conn.execute(
+                    "INSERT INTO tasks "
+                    "(title, priority, completed, deadline, content_hash) "
+                    "VALUES (?, ?, ?, ?, 0)",
+                    (title, priority, completed, deadline),
+                )
+            else:
+                conn.execute(
+                    "INSERT INTO tasks (title, priority, completed, deadline) "
+                    "VALUES (?, ?, ?, ?)",
+                    (title, priority, completed, deadline),
+                )
+    conn.close()
+
+
+def _upgrade(path):
+    env = dict(os.environ, TODO_DB_PATH=str(path), PYTHONPATH=ROOT)
+    result = subprocess.run(
+        [sys.executable, "-c", CHECK],
+        env=env,
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+@pytest.mark.parametrize(
+    "schema, with_hash", [(V1_SCHEMA, False), (V2_SCHEMA, True)], ids=["v1", "v2"]
+)
+def test_upgrade_keeps_rows_deadlines_and_indexes(tmp_path, schema, with_hash):
+    path = tmp_path / "old.db"
+    _seed(path, schema, with_hash)
+
+    result = _upgrade(path)
+
+    assert result["version"] == SCHEMA_VERSION
+    assert result["search"] == ["Résumé review"]
+    conn = sqlite3.connect(path)
+    rows = conn.execute(
+        "SELECT title, priority, completed, deadline, typeof(deadline) "
+        "FROM tasks ORDER BY id"
+    ).fetchall()
+    expected = [
+        (title, priority, completed, day_number(new) if new else None)
+        for title, priority, completed, _, new in TASKS
+    ]
+    assert [row[:4] for row in rows] == expected
+    assert {row[4] for row in rows} <= {"integer", "null"}
+
+    assert conn.execute("PRAGMA integrity_check").fetchall() == [("ok",)]
+    # Raises if the FTS index does not match the rebuilt tasks table
+    conn.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('integrity-check')")
+
+    if with_hash:
+        counts = conn.execute(
+            "SELECT SUM(count), typeof(deadline) FROM task_counts "
+            "WHERE deadline IS NOT NULL GROUP BY typeof(deadline)"
+        ).fetchall()
+        assert counts == [(2, "integer")]
+        assert result["stats"]["total"] == len(TASKS)
+    conn.close()
@@ -0,0 +1,62 @@
+"""Tests that every sorted read agrees on the (key, id) order."""
+
+from datetime import date
+
+import pytest
+
+from backend.utils import sort_tasks
+
+
+@pytest.mark.parametrize("key", ["priority", "title", "deadline", "id"])
+@pytest.mark.parametrize("reverse", [False, True])
+def test_sort_orders_agree(db, key, reverse):
+    db.add_tasks(
+        {
+            "title": f"Task {i % 4}",
+            "priority": i % 3 + 1,
+            "deadline": date(2026, 1, i % 5 + 1) if i % 2 else None,
+        }
+        for i in range(30)
+    )
+
+    in_sql = [task.id for task in db.query_tasks(key=key, reverse=reverse)]
+    paged = [task.id for task in db.iter_tasks(key=key, reverse=reverse, page_size=7)]
+    in_python = [task.id for task in sort_tasks(db.get_all_tasks(), key, reverse)]
+
+    assert in_sql == paged == in_python
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_keyset_pages_through_ties(db, reverse):
+    # Every priority is shared by many tasks and most deadlines are NULL,
+    # so most page boundaries fall inside a run of equal sort values
+    db.add_tasks(
+        {
+            "title": f"Task {i}",
+            "priority": 2 if i % 5 else 3,
+            "deadline": date(2026, 1, 1) if i % 7 == 0 else None,
+        }
+        for i in range(23)
+    )
+
+    for key in ("priority", "deadline"):
+        expected = [task.id for task in db.query_tasks(key=key, reverse=reverse)]
+        paged, after = [], None
+        while True:
+            page = db.get_tasks_page(key=key, reverse=reverse, after=after, limit=4)
+            paged.extend(task.id for task in page)
+            if len(page) < 4:
+                break
+            after = page[-1]
+
+        # NULLs first, then values, ties by ID; reverse is the exact reverse
+        ordered = sorted(
+            db.get_all_tasks(),
+            key=lambda task: (
+                getattr(task, key) is not None,
+                getattr(task, key) or 0,
+                task.id,
+            ),
+        )
+        ids = [task.id for task in ordered]
+        assert paged == expected == (ids[::-1] if reverse else ids)
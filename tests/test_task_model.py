@@ -0,0 +1,55 @@
+"""Tests for the GUI table and filter models (Qt on the offscreen platform)."""
+
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PySide6.QtWidgets")
+
+from backend.database import TaskRow  # noqa: E402
+from frontend.task_model import TaskFilterModel, TaskTableModel  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def models(app):
+    tasks = [
+        TaskRow(1, "Write report", 3, False, None),
+        TaskRow(2, "Review report", 2, False, None),
+        TaskRow(3, "Buy milk", 1, False, None),
+    ]
+    source = TaskTableModel(fetch_page=lambda **query: list(tasks))
+    source.reload()
+    search = TaskFilterModel(source)
+    search.set_search("report")
+    return source, search
+
+
+def _shown(search):
+    source = search.sourceModel()
+    return {
+        source.task_at(search.mapToSource(search.index(row, 0)).row()).id
+        for row in range(search.rowCount())
+    }
+
+
+def test_search_drops_task_renamed_away(models):
+    source, search = models
+    assert _shown(search) == {1, 2}
+
+    source.update_task(source.views.get(1), title="Draft")
+
+    assert _shown(search) == {2}
+
+
+def test_search_drops_removed_task_readded_without_match(models):
+    source, search = models
+    source.remove_task(source.views.get(2))
+    source.insert_task(TaskRow(2, "Call the bank", 2, False, None))
+
+    assert _shown(search) == {1}
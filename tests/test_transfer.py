@@ -0,0 +1,39 @@
+"""Tests for backend.transfer's import deduplication."""
+
+from datetime import date
+
+from sqlalchemy import text
+
+from backend.transfer import import_records
+
+
+def test_import_skips_titles_written_without_a_hash(db):
+    with db.engine.begin() as conn:
+        conn.execute(text("INSERT INTO tasks (title, priority) VALUES ('Raw', 1)"))
+
+    added = import_records([{"title": "Raw"}, {"title": "New"}])
+
+    assert added == 1
+    assert sorted(task.title for task in db.get_all_tasks()) == ["New", "Raw"]
+
+
+def test_import_skips_existing_and_repeated_titles(db):
+    db.add_task("Existing")
+    records = [
+        {"title": "Existing"},
+        {"title": "New", "priority": 3, "deadline": "01-05-2026"},
+        {"title": "New"},  # Repeated within a batch
+        {"title": "existing"},  # Titles match exactly, case included
+        {"title": "Later"},
+        {"title": "New"},  # Repeated in a later batch
+    ]
+
+    progress = []
+    added = import_records(records, batch_size=2, progress=progress.append)
+
+    assert added == 3
+    assert progress == [1, 2, 3]
+    tasks = {task.title: task for task in db.get_all_tasks()}
+    assert sorted(tasks) == ["Existing", "Later", "New", "existing"]
+    assert tasks["New"].priority == 3
+    assert tasks["New"].deadline == date(2026, 5, 1)